@@ -1,11 +1,39 @@
+from datetime import datetime
+
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Q
+from django.db.models.functions import Length
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from .analytics import DASHBOARD_WINDOWS, DEFAULT_DASHBOARD_WINDOW, dashboard_data
+from .archive import archivable, archive_submissions, get_archive_after_days, restore_archive
+from .exports import export_response
+from .images import get_thumbnail
+from .search import search_submissions
 from .models import (
     AboutMe, Experience, BombayShark, GalleryImage,
     Certification, ContactSubmission, CompanyLogo,
     # New models for redesign
-    Testimonial, Project, ProjectImage, ActionPhoto
+    Testimonial, Project, ProjectImage, ActionPhoto,
+    BackgroundTask, SubmissionArchive,
 )
 
+# Thumbnails are rendered at twice the displayed height for high-DPI screens
+THUMBNAIL_SCALE = 2
+
+
+def thumbnail_preview(image, max_height, style=''):
+    """<img> preview of an uploaded image, served from a cached thumbnail"""
+    name = get_thumbnail(image, max_height * THUMBNAIL_SCALE)
+    url = image.storage.url(name) if name else image.url
+    return format_html('<img src="{}" style="max-height: {}px;{}"/>', url, max_height, style)
+
 
 class GalleryImageInline(admin.TabularInline):
     model = GalleryImage
@@ -15,11 +43,30 @@ class GalleryImageInline(admin.TabularInline):
     
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 100px;"/>', obj.image.url)
+            return thumbnail_preview(obj.image, 100)
         return "No image"
     image_preview.short_description = "Preview"
 
 
+class ProjectImageInline(admin.TabularInline):
+    model = ProjectImage
+    extra = 1
+    fields = ['image', 'caption', 'order', 'image_preview']
+    readonly_fields = ['image_preview']
+    
+    def image_preview(self, obj):
+        if obj.image:
+            return thumbnail_preview(obj.image, 100)
+        return "No image"
+    image_preview.short_description = "Preview"
+
+
+class ProjectTestimonialInline(admin.TabularInline):
+    model = Testimonial
+    extra = 0
+    fields = ['name', 'role', 'company', 'quote', 'order']
+
+
 @admin.register(AboutMe)
 class AboutMeAdmin(admin.ModelAdmin):
     list_display = ['name', 'title', 'email', 'phone', 'photo_preview']
@@ -49,8 +96,7 @@ class AboutMeAdmin(admin.ModelAdmin):
     
     def photo_preview(self, obj):
         if obj.profile_photo:
-            return format_html('<img src="{}" style="max-height: 200px; border-radius: 10px;"/>', 
-                             obj.profile_photo.url)
+            return thumbnail_preview(obj.profile_photo, 200, ' border-radius: 10px;')
         return "No photo uploaded"
     photo_preview.short_description = "Photo Preview"
     
@@ -88,7 +134,7 @@ class ExperienceAdmin(admin.ModelAdmin):
     
     def logo_preview(self, obj):
         if obj.company_logo:
-            return format_html('<img src="{}" style="max-height: 100px;"/>', obj.company_logo.url)
+            return thumbnail_preview(obj.company_logo, 100)
         return "No logo"
     logo_preview.short_description = "Logo Preview"
 
@@ -117,8 +163,7 @@ class BombaySharkAdmin(admin.ModelAdmin):
     
     def hero_preview(self, obj):
         if obj.hero_image:
-            return format_html('<img src="{}" style="max-height: 200px; border-radius: 10px;"/>', 
-                             obj.hero_image.url)
+            return thumbnail_preview(obj.hero_image, 200, ' border-radius: 10px;')
         return "No image"
     hero_preview.short_description = "Hero Image Preview"
     
@@ -152,19 +197,141 @@ class CertificationAdmin(admin.ModelAdmin):
     
     def badge_preview(self, obj):
         if obj.certificate_image:
-            return format_html('<img src="{}" style="max-height: 80px;"/>', obj.certificate_image.url)
+            return thumbnail_preview(obj.certificate_image, 80)
         return "No badge"
     badge_preview.short_description = "Badge Preview"
 
 
+# Keyset pagination cursors: "<submitted_at ISO timestamp>_<pk>" of the
+# last row shown (older) or the first row shown (newer)
+OLDER_VAR = 'older'
+NEWER_VAR = 'newer'
+
+# Counting stops here; larger result sets show as "10,000+"
+SUBMISSION_COUNT_LIMIT = 10000
+
+
+def encode_cursor(submission):
+    return f'{submission.submitted_at.isoformat()}_{submission.pk}'
+
+
+def decode_cursor(value):
+    submitted_at, _, pk = value.rpartition('_')
+    try:
+        return datetime.fromisoformat(submitted_at), int(pk)
+    except ValueError:
+        raise IncorrectLookupParameters(f'Invalid cursor: {value}')
+
+
+class SubmissionChangeList(ChangeList):
+    """
+    Changelist paging by (submitted_at, id) instead of OFFSET, with a
+    bounded count, so every page costs the same however deep it is and
+    however many submissions have piled up
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        for name in (OLDER_VAR, NEWER_VAR):
+            lookup_params.pop(name, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Changing a filter or search starts again from the newest page
+        return super().get_query_string(new_params, [*(remove or []), OLDER_VAR, NEWER_VAR])
+
+    def get_ordering(self, request, queryset):
+        # Fixed order - the cursors depend on it
+        return ['-submitted_at', '-pk']
+
+    def get_results(self, request):
+        queryset = self.queryset
+        per_page = self.list_per_page
+        older, newer = request.GET.get(OLDER_VAR), request.GET.get(NEWER_VAR)
+
+        if newer:
+            submitted_at, pk = decode_cursor(newer)
+            rows = list(queryset.filter(
+                Q(submitted_at__gt=submitted_at) | Q(submitted_at=submitted_at, pk__gt=pk)
+            ).reverse()[:per_page + 1])
+            has_newer, has_older = len(rows) > per_page, True
+            rows = rows[:per_page][::-1]
+        else:
+            if older:
+                submitted_at, pk = decode_cursor(older)
+                queryset = queryset.filter(
+                    Q(submitted_at__lt=submitted_at) | Q(submitted_at=submitted_at, pk__lt=pk)
+                )
+            rows = list(queryset[:per_page + 1])
+            has_newer, has_older = bool(older), len(rows) > per_page
+            rows = rows[:per_page]
+
+        # The list_editable formset needs a queryset rather than a list
+        self.result_list = self.queryset.filter(pk__in=[row.pk for row in rows])
+        self.older_url = (
+            self.get_query_string({OLDER_VAR: encode_cursor(rows[-1])}) if has_older and rows else None
+        )
+        self.newer_url = (
+            self.get_query_string({NEWER_VAR: encode_cursor(rows[0])}) if has_newer and rows else None
+        )
+
+        count = self.queryset.order_by()[:SUBMISSION_COUNT_LIMIT + 1].count()
+        self.result_count = count
+        self.result_count_display = (
+            f'{SUBMISSION_COUNT_LIMIT:,}+' if count > SUBMISSION_COUNT_LIMIT else f'{count:,}'
+        )
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = bool(self.older_url or self.newer_url)
+        self.paginator = None
+
+
+class SubmissionFolderFilter(admin.SimpleListFilter):
+    """Inbox (not archived) by default"""
+    title = 'folder'
+    parameter_name = 'folder'
+    
+    def lookups(self, request, model_admin):
+        return [('archived', 'Archived'), ('all', 'All')]
+    
+    def queryset(self, request, queryset):
+        if self.value() == 'archived':
+            return queryset.filter(is_archived=True)
+        if self.value() == 'all':
+            return queryset
+        return queryset.filter(is_archived=False)
+    
+    def choices(self, changelist):
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(remove=[self.parameter_name]),
+            'display': 'Inbox',
+        }
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': self.value() == lookup,
+                'query_string': changelist.get_query_string({self.parameter_name: lookup}),
+                'display': title,
+            }
+
+
 @admin.register(ContactSubmission)
 class ContactSubmissionAdmin(admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'interest_type', 'submitted_at', 'is_read']
-    list_filter = ['is_read', 'interest_type', 'age_group', 'submitted_at']
+    list_filter = [SubmissionFolderFilter, 'is_read', 'interest_type', 'age_group', 'submitted_at']
+    # Searched through the full-text index - see get_search_results
     search_fields = ['name', 'email', 'subject', 'message']
+    search_help_text = "Matches words (or their beginnings) in the name, email, subject and message"
     readonly_fields = ['name', 'email', 'phone', 'subject', 'message', 'interest_type', 
                        'age_group', 'submitted_at']
     list_editable = ['is_read']
+    # Paged by submission time; see SubmissionChangeList
+    sortable_by = []
+    show_full_result_count = False
+    actions = ['mark_read', 'mark_unread', 'archive', 'unarchive', 'move_to_archive_table',
+               'export_csv', 'export_jsonl']
     
     fieldsets = (
         ('Contact Information', {
@@ -177,15 +344,147 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
             'fields': ('interest_type', 'age_group')
         }),
         ('Admin', {
-            'fields': ('is_read', 'admin_notes', 'submitted_at')
+            'fields': ('is_read', 'is_archived', 'admin_notes', 'submitted_at')
         }),
     )
     
+    def get_changelist(self, request, **kwargs):
+        return SubmissionChangeList
+    
+    def get_urls(self):
+        return [
+            path(
+                'dashboard/',
+                self.admin_site.admin_view(self.dashboard_view),
+                name='portfolio_contactsubmission_dashboard',
+            ),
+        ] + super().get_urls()
+    
+    def dashboard_view(self, request):
+        # Charts are drawn from the daily rollups, never the submissions
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        try:
+            days = int(request.GET.get('days', DEFAULT_DASHBOARD_WINDOW))
+        except ValueError:
+            days = DEFAULT_DASHBOARD_WINDOW
+        if days not in DASHBOARD_WINDOWS:
+            days = DEFAULT_DASHBOARD_WINDOW
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Enrollment dashboard',
+            'windows': DASHBOARD_WINDOWS,
+            **dashboard_data(days),
+        }
+        return TemplateResponse(request, 'admin/portfolio/contactsubmission/dashboard.html', context)
+    
+    def get_search_results(self, request, queryset, search_term):
+        return search_submissions(queryset, search_term), False
+    
+    # Flag changes are a single UPDATE, also when "select all" spans every page
+    
+    @admin.action(description="Mark selected submissions as read")
+    def mark_read(self, request, queryset):
+        updated = queryset.update(is_read=True)
+        self.message_user(request, f"{updated} submission(s) marked as read.")
+    
+    @admin.action(description="Mark selected submissions as unread")
+    def mark_unread(self, request, queryset):
+        updated = queryset.update(is_read=False)
+        self.message_user(request, f"{updated} submission(s) marked as unread.")
+    
+    @admin.action(description="Archive selected submissions")
+    def archive(self, request, queryset):
+        updated = queryset.update(is_archived=True)
+        self.message_user(request, f"{updated} submission(s) archived.")
+    
+    @admin.action(description="Move selected submissions back to the inbox")
+    def unarchive(self, request, queryset):
+        updated = queryset.update(is_archived=False)
+        self.message_user(request, f"{updated} submission(s) moved to the inbox.")
+    
+    @admin.action(description="Move old read submissions to the compressed archive")
+    def move_to_archive_table(self, request, queryset):
+        selected = queryset.count()
+        moved = sum(archive.count for archive in archive_submissions(archivable(queryset)))
+        message = f"{moved} submission(s) moved to the compressed archive."
+        if moved < selected:
+            message += (
+                f" {selected - moved} skipped: only read submissions older than "
+                f"{get_archive_after_days()} days are archived."
+            )
+        self.message_user(request, message)
+    
+    # Exports stream rows as they are read - "select all" exports every
+    # matching submission without loading them into memory
+    
+    @admin.action(description="Export selected submissions as CSV")
+    def export_csv(self, request, queryset):
+        return export_response(request, queryset, 'csv')
+    
+    @admin.action(description="Export selected submissions as JSON lines")
+    def export_jsonl(self, request, queryset):
+        return export_response(request, queryset, 'jsonl')
+    
     def has_add_permission(self, request):
         # Prevent manual creation - should only come from form
         return False
 
 
+@admin.register(SubmissionArchive)
+class SubmissionArchiveAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'first_submitted_at', 'last_submitted_at', 'count',
+                    'compressed_size', 'download_link', 'created_at']
+    fields = ['first_submitted_at', 'last_submitted_at', 'count', 'compressed_size',
+              'download_link', 'created_at']
+    readonly_fields = fields
+    date_hierarchy = 'last_submitted_at'
+    actions = ['restore']
+    
+    def get_queryset(self, request):
+        # Sizes come from the database; the blobs are only read on download
+        return super().get_queryset(request).defer('data').annotate(compressed_size=Length('data'))
+    
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='portfolio_submissionarchive_download',
+            ),
+        ] + super().get_urls()
+    
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        archive = get_object_or_404(SubmissionArchive, pk=pk)
+        response = HttpResponse(bytes(archive.data), content_type='application/gzip')
+        response['Content-Disposition'] = f'attachment; filename="submissions-{pk}.jsonl.gz"'
+        return response
+    
+    def compressed_size(self, obj):
+        return f"{obj.compressed_size / 1024:,.1f} KB"
+    compressed_size.short_description = "Size"
+    
+    def download_link(self, obj):
+        url = reverse('admin:portfolio_submissionarchive_download', args=[obj.pk])
+        return format_html('<a href="{}">submissions-{}.jsonl.gz</a>', url, obj.pk)
+    download_link.short_description = "Download"
+    
+    @admin.action(description="Restore the submissions of selected archives")
+    def restore(self, request, queryset):
+        restored = sum(restore_archive(archive) for archive in queryset.defer(None))
+        self.message_user(request, f"{restored} submission(s) restored.")
+    
+    def has_add_permission(self, request):
+        # Written by archive_submissions and the submission admin action
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(CompanyLogo)
 class CompanyLogoAdmin(admin.ModelAdmin):
     list_display = ['company_name', 'display_on_homepage', 'order', 'logo_preview']
@@ -212,12 +511,84 @@ class CompanyLogoAdmin(admin.ModelAdmin):
     
     def logo_preview(self, obj):
         if obj.logo:
-            return format_html('<img src="{}" style="max-height: 80px; max-width: 150px; object-fit: contain;"/>', 
-                             obj.logo.url)
+            return thumbnail_preview(obj.logo, 80, ' max-width: 150px; object-fit: contain;')
         return "No logo"
     logo_preview.short_description = "Logo Preview"
 
 
+@admin.register(Project)
+class ProjectAdmin(admin.ModelAdmin):
+    list_display = ['title', 'slug', 'featured', 'order', 'hero_preview']
+    list_filter = ['featured']
+    search_fields = ['title', 'subtitle', 'tags']
+    list_editable = ['featured', 'order']
+    prepopulated_fields = {'slug': ('title',)}
+    readonly_fields = ['created_at', 'hero_preview']
+    inlines = [ProjectImageInline, ProjectTestimonialInline]
+    
+    fieldsets = (
+        ('Basic Information', {
+            'fields': ('title', 'slug', 'subtitle', 'hero_image', 'hero_preview')
+        }),
+        ('The Story', {
+            'fields': ('problem', 'solution', 'impact')
+        }),
+        ('Display', {
+            'fields': ('tags', 'featured', 'order')
+        }),
+        ('Meta', {
+            'fields': ('created_at',),
+            'classes': ('collapse',)
+        }),
+    )
+    
+    def hero_preview(self, obj):
+        if obj.hero_image:
+            return thumbnail_preview(obj.hero_image, 100)
+        return "No image"
+    hero_preview.short_description = "Hero Image Preview"
+
+
+@admin.register(Testimonial)
+class TestimonialAdmin(admin.ModelAdmin):
+    list_display = ['name', 'company', 'project', 'rating', 'featured', 'order']
+    list_filter = ['featured', 'rating']
+    search_fields = ['name', 'company', 'quote']
+    list_editable = ['featured', 'order']
+    list_select_related = ['project']
+
+
+@admin.register(BackgroundTask)
+class BackgroundTaskAdmin(admin.ModelAdmin):
+    list_display = ['task', 'target', 'status', 'progress_bar', 'attempts', 'run_after', 'finished_at']
+    list_filter = ['status', 'task']
+    readonly_fields = ['task', 'payload', 'status', 'progress', 'attempts', 'max_attempts',
+                       'last_error', 'run_after', 'created_at', 'started_at', 'finished_at']
+    actions = ['retry_tasks']
+    
+    def target(self, obj):
+        payload = obj.payload or {}
+        if 'model' in payload:
+            return f"{payload['model']} #{payload.get('pk')} ({payload.get('field', '')})"
+        return '-'
+    target.short_description = "Target"
+    
+    def progress_bar(self, obj):
+        return format_html('<progress value="{}" max="100"></progress> {}%', obj.progress, obj.progress)
+    progress_bar.short_description = "Progress"
+    
+    @admin.action(description="Retry selected tasks")
+    def retry_tasks(self, request, queryset):
+        updated = queryset.exclude(status=BackgroundTask.STATUS_RUNNING).update(
+            status=BackgroundTask.STATUS_PENDING, attempts=0, run_after=timezone.now(), last_error=''
+        )
+        self.message_user(request, f"{updated} task(s) queued for retry.")
+    
+    def has_add_permission(self, request):
+        # Tasks are queued by the application, not created by hand
+        return False
+
+
 # Customize admin site header
 admin.site.site_header = "Sumedh Rajarshi Portfolio Admin"
 admin.site.site_title = "Portfolio Admin"
@@ -0,0 +1,157 @@
+"""
+Daily rollups of contact submissions for the enrollment dashboard.
+
+``SubmissionDailyCount`` holds one row per day, interest type and age group.
+Submissions are counted as they are created: form saves by a ``post_save``
+receiver, and batched ingestion - whose ``bulk_create`` sends no signals -
+by calling ``record_submissions`` itself. Raw saves (archive restores,
+fixtures) are not counted again, and archiving or deleting submissions
+leaves the counts alone, so the rollups keep the whole history.
+
+The dashboard only reads the rollup rows inside its date window (at most
+one per day and interest/age combination), so it costs the same however
+many submissions have been received. ``rebuild_submission_rollups``
+recounts everything from the live table and the archives.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .archive import archive_rows
+from .exports import ENROLLMENT_INTERESTS
+from .models import ContactSubmission, SubmissionArchive, SubmissionDailyCount
+
+# Dashboard date ranges, in days
+DASHBOARD_WINDOWS = (30, 90, 365)
+DEFAULT_DASHBOARD_WINDOW = 90
+
+# Longer windows are charted by week
+WEEKLY_AFTER_DAYS = 90
+
+
+def rollup_key(submitted_at, interest_type, age_group):
+    return (timezone.localdate(submitted_at), interest_type, age_group)
+
+
+def add_counts(counts):
+    """Add a ``{(day, interest_type, age_group): n}`` mapping to the rollups"""
+    with transaction.atomic():
+        for (day, interest_type, age_group), n in counts.items():
+            rollup = SubmissionDailyCount.objects.filter(
+                day=day, interest_type=interest_type, age_group=age_group
+            )
+            if rollup.update(count=F('count') + n):
+                continue
+            try:
+                with transaction.atomic():
+                    SubmissionDailyCount.objects.create(
+                        day=day, interest_type=interest_type, age_group=age_group, count=n
+                    )
+            except IntegrityError:
+                # Created by a concurrent request since the UPDATE
+                rollup.update(count=F('count') + n)
+
+
+def record_submissions(submissions):
+    """Count newly created submissions"""
+    add_counts(Counter(
+        rollup_key(submission.submitted_at, submission.interest_type, submission.age_group)
+        for submission in submissions
+    ))
+
+
+def count_submissions(submissions, archives):
+    """
+    Rollup counts of a ContactSubmission queryset plus the submissions
+    stored in a SubmissionArchive queryset
+    """
+    counts = Counter()
+    grouped = submissions.annotate(day=TruncDate('submitted_at')).values_list(
+        'day', 'interest_type', 'age_group'
+    ).annotate(n=Count('pk')).order_by()
+    for day, interest_type, age_group, n in grouped:
+        counts[(day, interest_type, age_group)] += n
+    for archive in archives.iterator(chunk_size=1):
+        for row in archive_rows(archive):
+            counts[rollup_key(
+                parse_datetime(row['submitted_at']), row['interest_type'], row['age_group']
+            )] += 1
+    return counts
+
+
+def rebuild_rollups():
+    """Replace the rollups with a full recount. Returns the number of submissions."""
+    with transaction.atomic():
+        counts = count_submissions(ContactSubmission.objects.all(), SubmissionArchive.objects.all())
+        SubmissionDailyCount.objects.all().delete()
+        SubmissionDailyCount.objects.bulk_create([
+            SubmissionDailyCount(day=day, interest_type=interest_type, age_group=age_group, count=n)
+            for (day, interest_type, age_group), n in counts.items()
+        ], batch_size=500)
+    return sum(counts.values())
+
+
+def _bars(counts, labels):
+    # Rows for a horizontal bar chart, widths relative to the largest bar
+    largest = max(counts.values(), default=0) or 1
+    return [
+        {'label': label, 'count': counts[value], 'percent': round(100 * counts[value] / largest)}
+        for value, label in labels
+    ]
+
+
+def dashboard_data(days=DEFAULT_DASHBOARD_WINDOW, today=None):
+    """Chart data for the ``days`` up to and including ``today``"""
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    weekly = days > WEEKLY_AFTER_DAYS
+
+    def bucket(day):
+        return day - timedelta(days=day.weekday()) if weekly else day
+
+    step = timedelta(days=7 if weekly else 1)
+    timeline = {}
+    day = bucket(start)
+    while day <= today:
+        timeline[day] = Counter()
+        day += step
+
+    by_interest = Counter()
+    by_age = Counter()
+    rows = SubmissionDailyCount.objects.filter(day__range=(start, today)).values_list(
+        'day', 'interest_type', 'age_group', 'count'
+    )
+    for day, interest_type, age_group, count in rows:
+        enrollment = interest_type in ENROLLMENT_INTERESTS
+        timeline[bucket(day)]['enrollment' if enrollment else 'general'] += count
+        by_interest[interest_type] += count
+        if enrollment:
+            by_age[age_group] += count
+
+    busiest = max((sum(counts.values()) for counts in timeline.values()), default=0) or 1
+    return {
+        'days': days,
+        'start': start,
+        'today': today,
+        'weekly': weekly,
+        'total': sum(by_interest.values()),
+        'enrollment_total': sum(by_age.values()),
+        'timeline': [
+            {
+                'day': day,
+                'enrollment': counts['enrollment'],
+                'general': counts['general'],
+                'total': counts['enrollment'] + counts['general'],
+                'enrollment_percent': round(100 * counts['enrollment'] / busiest, 1),
+                'general_percent': round(100 * counts['general'] / busiest, 1),
+            }
+            for day, counts in timeline.items()
+        ],
+        'by_interest': _bars(by_interest, ContactSubmission.ENROLLMENT_INTERESTS),
+        'by_age': _bars(by_age, ContactSubmission.AGE_GROUPS + [('', 'Not given')]),
+    }
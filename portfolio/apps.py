@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class PortfolioConfig(AppConfig):
     name = "portfolio"
+
+    def ready(self):
+        # Register signal handlers and background tasks
+        from . import signals, notifications, replica  # noqa: F401
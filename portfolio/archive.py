@@ -0,0 +1,122 @@
+"""
+Archival of old contact submissions.
+
+Read submissions older than ``PORTFOLIO_ARCHIVE_AFTER_DAYS`` are moved out
+of the live table into ``SubmissionArchive`` rows, each holding a chunk of
+submissions as gzip-compressed JSON lines. Every chunk is written and its
+rows deleted in one transaction, so a submission is always in exactly one
+place. The live table - what the admin lists and searches - stays small.
+
+Archived submissions can be downloaded from the admin as ``.jsonl.gz`` or
+restored (with their original ids) by the admin action or
+``archive_submissions --restore``.
+"""
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ContactSubmission, SubmissionArchive
+
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision, so restored rows are unchanged"""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_archive_after_days():
+    return getattr(settings, 'PORTFOLIO_ARCHIVE_AFTER_DAYS', 180)
+
+
+def get_archive_chunk_size():
+    return getattr(settings, 'PORTFOLIO_ARCHIVE_CHUNK_SIZE', 1000)
+
+
+def archivable(queryset=None, days=None):
+    """Read submissions older than the cutoff"""
+    if queryset is None:
+        queryset = ContactSubmission.objects.all()
+    days = get_archive_after_days() if days is None else days
+    return queryset.filter(is_read=True, submitted_at__lt=timezone.now() - timedelta(days=days))
+
+
+def encode_rows(rows):
+    """gzip-compressed JSON lines of ``values()`` dicts"""
+    lines = (json.dumps(row, cls=ArchiveJSONEncoder, ensure_ascii=False) for row in rows)
+    return gzip.compress('\n'.join(lines).encode('utf-8'), compresslevel=9)
+
+
+def archive_chunk(queryset, chunk_size=None):
+    """
+    Move the oldest ``chunk_size`` submissions of ``queryset`` into a new
+    ``SubmissionArchive``. Returns it, or None when nothing is left.
+    """
+    chunk_size = chunk_size or get_archive_chunk_size()
+    with transaction.atomic():
+        rows = list(queryset.order_by('submitted_at', 'pk').values()[:chunk_size])
+        if not rows:
+            return None
+        archive = SubmissionArchive.objects.create(
+            first_submitted_at=rows[0]['submitted_at'],
+            last_submitted_at=rows[-1]['submitted_at'],
+            count=len(rows),
+            data=encode_rows(rows),
+        )
+        ContactSubmission.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+    return archive
+
+
+def archive_submissions(queryset, chunk_size=None):
+    """Archive all of ``queryset`` chunk by chunk, yielding each new archive"""
+    while True:
+        archive = archive_chunk(queryset, chunk_size)
+        if archive is None:
+            return
+        yield archive
+
+
+def archive_rows(archive):
+    """Submissions stored in ``archive``, as decoded JSON dicts"""
+    data = gzip.decompress(bytes(archive.data)).decode('utf-8')
+    for line in data.splitlines():
+        yield json.loads(line)
+
+
+def read_archive(archive):
+    """Unsaved ``ContactSubmission`` instances stored in ``archive``"""
+    fields = {field.attname: field for field in ContactSubmission._meta.concrete_fields}
+    for row in archive_rows(archive):
+        yield ContactSubmission(**{
+            name: fields[name].to_python(value)
+            for name, value in row.items() if name in fields
+        })
+
+
+def restore_archive(archive):
+    """
+    Put the submissions of ``archive`` back in the live table and delete
+    the archive. Returns the number of submissions restored.
+    """
+    with transaction.atomic():
+        submissions = list(read_archive(archive))
+        existing = set(ContactSubmission.objects.filter(
+            pk__in=[submission.pk for submission in submissions]
+        ).values_list('pk', flat=True))
+        restored = 0
+        for submission in submissions:
+            if submission.pk in existing:
+                continue
+            # Raw saves keep the original submitted_at (no auto_now_add)
+            # and are ignored by signal handlers, as with loaddata
+            submission.save_base(raw=True, force_insert=True)
+            restored += 1
+        archive.delete()
+    return restored
@@ -0,0 +1,94 @@
+"""
+Caching helpers for public portfolio pages.
+
+Rendered pages are stored under a key that embeds a content version number.
+The version is bumped from model signals (see ``portfolio.signals``) whenever
+homepage content is edited, so stale pages simply stop being looked up and
+new content appears immediately, without waiting for a TTL to expire.
+
+Behind the page cache, each homepage section is cached as a template
+fragment keyed by the state of the models it renders, so an edit to one
+section only re-renders that section when the page is rebuilt.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import (
+    AboutMe, Experience, BombayShark, GalleryImage, Certification, CompanyLogo
+)
+
+CONTENT_VERSION_KEY = 'portfolio:content-version'
+
+# Placeholder rendered in place of the CSRF token so cached pages can be
+# shared between visitors; swapped for a fresh token on every response.
+CSRF_TOKEN_PLACEHOLDER = '__portfolio_csrf_token__'
+
+# Homepage sections and the models each one renders
+HOMEPAGE_SECTIONS = {
+    'about': (AboutMe,),
+    'experience': (Experience,),
+    'bombay_sharks': (BombayShark, GalleryImage),
+    'certifications': (Certification,),
+    'companies': (CompanyLogo,),
+}
+
+
+def get_page_cache_timeout():
+    """Safety-net lifetime for cached pages (versioning handles freshness)"""
+    return getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def get_content_version():
+    """Return the current content version, initialising it if missing"""
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        cache.add(CONTENT_VERSION_KEY, _initial_version(), timeout=None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def _initial_version():
+    # Seeded from the clock so a version lost to eviction or a restart can
+    # never collide with pages still cached under an earlier sequence.
+    return int(time.time() * 1000)
+
+
+def bump_content_version():
+    """Invalidate every cached page by moving to a new content version"""
+    try:
+        return cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        version = _initial_version()
+        cache.set(CONTENT_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def page_cache_key(path):
+    """Cache key for a rendered page at the current content version"""
+    return f'portfolio:page:{get_content_version()}:{path}'
+
+
+def get_section_cache_timeout():
+    """Lifetime of cached homepage section fragments"""
+    return getattr(settings, 'PORTFOLIO_SECTION_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+
+
+def get_section_versions():
+    """
+    Return a version string per homepage section, derived from the row count
+    and latest ``updated_at`` of every model the section renders. Used as the
+    vary-on argument of the section's ``{% cache %}`` fragment.
+    """
+    versions = {}
+    for section, section_models in HOMEPAGE_SECTIONS.items():
+        parts = []
+        for model in section_models:
+            state = model.objects.aggregate(total=Count('pk'), changed=Max('updated_at'))
+            changed = state['changed'].timestamp() if state['changed'] else 0
+            parts.append(f"{state['total']}-{changed}")
+        versions[section] = '.'.join(parts)
+    return versions
+
@@ -0,0 +1,152 @@
+"""
+Critical CSS extraction for the home page.
+
+``build_critical_css`` renders the home page, cuts it at the fold (the
+navigation plus the first section) and keeps only the stylesheet rules
+whose selectors can match that markup - including the ``@media`` variants
+and the ``@keyframes`` they animate with. The result is written to
+``static/css/critical.css``; ``base.html`` inlines it with
+``{% critical_css %}`` and loads the full bundle without blocking render.
+
+Matching is by the tags, classes and ids present in the markup, ignoring
+pseudo-classes and attribute selectors, so it errs on the side of keeping
+a rule.
+"""
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+CRITICAL_CSS = 'css/critical.css'
+
+# At-rules whose blocks contain ordinary rules to be filtered
+GROUPING_AT_RULES = ('@media', '@supports', '@layer')
+
+TAG_RE = re.compile(r'<([a-zA-Z][a-zA-Z0-9-]*)')
+CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"')
+ID_ATTR_RE = re.compile(r'\sid="([^"]*)"')
+PSEUDO_RE = re.compile(r'::?[\w-]+(\([^)]*\))?')
+ATTRIBUTE_RE = re.compile(r'\[[^\]]*\]')
+SIMPLE_SELECTOR_RE = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*)')
+ANIMATION_RE = re.compile(r'animation(?:-name)?:([^;}]+)')
+KEYFRAMES_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+
+_cache = {}
+
+
+def parse(css):
+    """
+    Split CSS into ``(prelude, body)`` pairs. Bodies of grouping at-rules
+    are parsed recursively into lists; all other bodies stay strings.
+    """
+    nodes = []
+    position = 0
+    while True:
+        start = css.find('{', position)
+        if start == -1:
+            break
+        prelude = css[position:start].strip()
+        depth, end = 1, start + 1
+        while depth and end < len(css):
+            depth += {'{': 1, '}': -1}.get(css[end], 0)
+            end += 1
+        body = css[start + 1:end - 1]
+        if prelude.startswith(GROUPING_AT_RULES):
+            body = parse(body)
+        # Statements such as @charset end in ';' before the next block
+        prelude = prelude.rsplit(';', 1)[-1].strip()
+        nodes.append((prelude, body))
+        position = end
+    return nodes
+
+
+def serialize(nodes):
+    return ''.join(
+        f'{prelude}{{{serialize(body) if isinstance(body, list) else body}}}'
+        for prelude, body in nodes
+    )
+
+
+def used_selectors(html):
+    """Tags, ``.classes`` and ``#ids`` present in ``html``"""
+    used = {tag.lower() for tag in TAG_RE.findall(html)}
+    for classes in CLASS_ATTR_RE.findall(html):
+        used.update(f'.{name}' for name in classes.split())
+    used.update(f'#{name}' for name in ID_ATTR_RE.findall(html))
+    return used
+
+
+def selector_matches(selector, used):
+    """Whether every tag, class and id in ``selector`` occurs in the markup"""
+    selector = ATTRIBUTE_RE.sub(' ', PSEUDO_RE.sub(' ', selector))
+    for prefix, name in SIMPLE_SELECTOR_RE.findall(selector):
+        token = f'{prefix}{name}' if prefix else name.lower()
+        if token not in used:
+            return False
+    return True
+
+
+def filter_rules(nodes, used):
+    kept = []
+    for prelude, body in nodes:
+        if isinstance(body, list):
+            children = filter_rules(body, used)
+            if children:
+                kept.append((prelude, children))
+        elif prelude.startswith('@font-face'):
+            kept.append((prelude, body))
+        elif prelude.startswith('@'):
+            # @keyframes are added back below if a kept rule uses them
+            continue
+        elif any(selector_matches(part, used) for part in prelude.split(',')):
+            kept.append((prelude, body))
+    return kept
+
+
+def keyframes(nodes):
+    """``{name: (prelude, body)}`` of every @keyframes block"""
+    found = {}
+    for prelude, body in nodes:
+        match = KEYFRAMES_RE.match(prelude)
+        if match and not isinstance(body, list):
+            found[match.group(1)] = (prelude, body)
+    return found
+
+
+def above_the_fold(html):
+    """The part of a rendered page visible before scrolling"""
+    main = html.find('<main')
+    fold = html.find('</section>', main if main != -1 else 0)
+    return html if fold == -1 else html[:fold + len('</section>')]
+
+
+def extract_critical_css(css, html):
+    """Rules of ``css`` needed to render ``html`` (already cut at the fold)"""
+    nodes = parse(css)
+    critical = filter_rules(nodes, used_selectors(html))
+    text = serialize(critical)
+
+    animations = set()
+    for value in ANIMATION_RE.findall(text):
+        animations.update(re.findall(r'[\w-]+', value))
+    animated = [rule for name, rule in keyframes(nodes).items() if name in animations]
+    return text + serialize(animated)
+
+
+def get_critical_css():
+    """Contents of the generated critical stylesheet, or '' if not built"""
+    if settings.DEBUG:
+        path = finders.find(CRITICAL_CSS)
+        if not path:
+            return ''
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    if CRITICAL_CSS not in _cache:
+        try:
+            with staticfiles_storage.open(CRITICAL_CSS) as f:
+                _cache[CRITICAL_CSS] = f.read().decode('utf-8')
+        except (OSError, ValueError):
+            _cache[CRITICAL_CSS] = ''
+    return _cache[CRITICAL_CSS]
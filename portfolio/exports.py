@@ -0,0 +1,136 @@
+"""
+Streaming CSV / JSON lines export of contact submissions.
+
+Rows are read with ``iterator(chunk_size=...)`` and encoded one at a time,
+so an export holds a single chunk in memory however many rows it covers.
+The admin actions wrap the generators in a ``StreamingHttpResponse`` (fed
+by an async iterator under ASGI, which would otherwise buffer a sync one
+whole); the ``export_submissions`` command writes them to a file or stdout.
+"""
+import csv
+import json
+import re
+from itertools import chain, islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .archive import read_archive
+from .models import SubmissionArchive
+
+EXPORT_FIELDS = (
+    'id', 'submitted_at', 'name', 'email', 'phone', 'subject', 'message',
+    'interest_type', 'age_group', 'is_read', 'admin_notes',
+)
+
+# Interests that make a submission an academy enrollment lead
+ENROLLMENT_INTERESTS = ('academy', 'both')
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Spreadsheet apps run cells starting with these as formulas, and the
+# exported text comes from the public contact form
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Phone numbers ('+91 98200 00000') start with '+' but can't call functions,
+# so they are exported as typed
+PHONE_NUMBER_RE = re.compile(r'^[\d\s()+-]+$')
+
+
+class Echo:
+    """File-like object that hands back what is written, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """``EXPORT_FIELDS`` tuples of ``queryset``, fetched chunk by chunk"""
+    return queryset.order_by('submitted_at', 'pk').values_list(*EXPORT_FIELDS).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def archived_export_rows(predicate=None, archives=None):
+    """
+    ``EXPORT_FIELDS`` tuples of archived submissions (those in ``archives``,
+    default all) for which ``predicate`` is true, oldest archive first.
+    Archives are decompressed one at a time.
+    """
+    if archives is None:
+        archives = SubmissionArchive.objects.all()
+    for archive in archives.order_by('first_submitted_at', 'pk').iterator(chunk_size=1):
+        for submission in read_archive(archive):
+            if predicate is None or predicate(submission):
+                yield tuple(getattr(submission, field) for field in EXPORT_FIELDS)
+
+
+def _csv_cell(value):
+    if (
+        isinstance(value, str)
+        and value.startswith(FORMULA_PREFIXES)
+        and not PHONE_NUMBER_RE.match(value)
+    ):
+        return f"'{value}"
+    return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+# format: (content type, file extension, line generator)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv', csv_lines),
+    'jsonl': ('application/x-ndjson', 'jsonl', jsonl_lines),
+}
+
+
+def export_lines(queryset, fmt, chunk_size=EXPORT_CHUNK_SIZE, archived=()):
+    """
+    Lines of ``queryset`` encoded in ``fmt`` ('csv' or 'jsonl'), preceded
+    by the rows of ``archived`` (see ``archived_export_rows``)
+    """
+    return EXPORT_FORMATS[fmt][2](chain(archived, export_rows(queryset, chunk_size)))
+
+
+def _next_lines(lines, count):
+    return list(islice(lines, count))
+
+
+async def async_lines(lines, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Async iterator over the sync generator ``lines``, advanced
+    ``chunk_size`` lines at a time in the thread that runs sync code (the
+    database cursor stays on one thread)
+    """
+    next_lines = sync_to_async(_next_lines)
+    while True:
+        chunk = await next_lines(lines, chunk_size)
+        if not chunk:
+            return
+        for line in chunk:
+            yield line
+
+
+def export_response(request, queryset, fmt, basename='submissions'):
+    """Download of ``queryset`` streamed as it is read"""
+    content_type, extension, _ = EXPORT_FORMATS[fmt]
+    lines = export_lines(queryset, fmt)
+    if isinstance(request, ASGIRequest):
+        lines = async_lines(lines)
+    response = StreamingHttpResponse(lines, content_type=f'{content_type}; charset=utf-8')
+    filename = f'{basename}-{timezone.localdate():%Y%m%d}.{extension}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
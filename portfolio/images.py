@@ -0,0 +1,381 @@
+"""
+Responsive image derivatives for uploaded ImageFields.
+
+Every saved image gets a set of downscaled copies stored next to the
+original (``profile/photo.jpg`` -> ``profile/photo.w480.webp`` ...) in the
+modern formats Pillow can encode (AVIF, WebP) plus a JPEG fallback, or PNG
+when the source has transparency. A small JSON manifest beside the original
+lists what was generated so templates can emit ``srcset`` attributes without
+touching the image files.
+
+Models using ``ImageMetadataMixin`` also store each image's displayed
+dimensions and a tiny blurred placeholder (LQIP) on the row, so templates
+can reserve the image's space and paint the placeholder while it
+lazy-loads.
+"""
+import base64
+import json
+import logging
+import os
+import re
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db.models import ImageField
+from PIL import ExifTags, Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+}
+
+# Longest side of the placeholder; the browser upscales it into a blur
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+# EXIF orientations that rotate the image by 90 degrees
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+# How long "no manifest yet" is cached. Manifests usually come from the
+# background worker, whose cache invalidation only reaches this process
+# through a shared cache
+MISSING_MANIFEST_TIMEOUT = 60
+
+THUMBNAIL_HEIGHT_RE = re.compile(r'\.thumb(\d+)\.[a-z0-9]+$')
+
+FILE_EXTENSIONS = {
+    'avif': 'avif',
+    'webp': 'webp',
+    'jpeg': 'jpg',
+    'png': 'png',
+}
+
+
+def get_responsive_widths():
+    """Target widths (in pixels) for generated derivatives"""
+    return getattr(settings, 'PORTFOLIO_IMAGE_WIDTHS', (480, 960, 1600))
+
+
+def get_image_quality():
+    """Encoder quality used for lossy derivative formats"""
+    return getattr(settings, 'PORTFOLIO_IMAGE_QUALITY', 80)
+
+
+def get_modern_formats():
+    """Modern formats supported by the installed Pillow, best first"""
+    Image.init()
+    return [fmt for fmt in ('avif', 'webp') if fmt.upper() in Image.SAVE]
+
+
+def manifest_name(name):
+    """Storage name of the derivative manifest for an original image"""
+    stem, _ = os.path.splitext(name)
+    return f'{stem}.responsive.json'
+
+
+def derivative_name(name, width, fmt):
+    """Storage name of a single derivative of an original image"""
+    stem, _ = os.path.splitext(name)
+    return f'{stem}.w{width}.{FILE_EXTENSIONS[fmt]}'
+
+
+def _manifest_cache_key(name):
+    return f'portfolio:responsive:{name}'
+
+
+def _replace(storage, name, content):
+    # Overwrite in place so regenerating never accumulates suffixed copies
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, content)
+
+
+def _encode(image, width, fmt):
+    if width < image.width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+    buffer = BytesIO()
+    if fmt == 'png':
+        image.save(buffer, format='PNG', optimize=True)
+    else:
+        image.save(buffer, format=fmt.upper(), quality=get_image_quality())
+    return ContentFile(buffer.getvalue())
+
+
+def generate_derivatives(fieldfile, progress=None):
+    """
+    Generate every derivative of ``fieldfile`` and write its manifest.
+    ``progress``, if given, is called with the percentage completed.
+    Returns the manifest dict.
+    """
+    storage = fieldfile.storage
+    with fieldfile.open('rb'):
+        image = ImageOps.exif_transpose(Image.open(fieldfile))
+        image.load()
+
+    has_alpha = _has_alpha(image)
+    fallback = 'png' if has_alpha else 'jpeg'
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    # Never upscale: targets wider than the original collapse onto it
+    widths = sorted({min(width, image.width) for width in get_responsive_widths()})
+
+    formats = get_modern_formats() + [fallback]
+    total = len(formats) * len(widths)
+    sources = {}
+    for fmt in formats:
+        sources[fmt] = []
+        for width in widths:
+            name = _replace(storage, derivative_name(fieldfile.name, width, fmt),
+                            _encode(image, width, fmt))
+            sources[fmt].append([width, name])
+            if progress:
+                progress(100 * sum(map(len, sources.values())) / total)
+
+    manifest = {
+        'width': image.width,
+        'height': image.height,
+        'fallback': fallback,
+        'sources': sources,
+    }
+    _replace(storage, manifest_name(fieldfile.name),
+             ContentFile(json.dumps(manifest).encode('utf-8')))
+    cache.delete(_manifest_cache_key(fieldfile.name))
+    return manifest
+
+
+def ensure_derivatives(fieldfile, force=False):
+    """Generate derivatives for ``fieldfile`` unless they already exist"""
+    if not fieldfile:
+        return None
+    if not force and fieldfile.storage.exists(manifest_name(fieldfile.name)):
+        return None
+    try:
+        return generate_derivatives(fieldfile)
+    except (OSError, ValueError) as exc:
+        # Missing or unreadable originals fall back to the plain upload
+        logger.warning('Could not generate derivatives for %s: %s', fieldfile.name, exc)
+        return None
+
+
+def get_manifest(fieldfile):
+    """Return the derivative manifest for ``fieldfile``, or None"""
+    if not fieldfile:
+        return None
+    key = _manifest_cache_key(fieldfile.name)
+    manifest = cache.get(key)
+    if manifest is None:
+        name = manifest_name(fieldfile.name)
+        manifest = {}
+        if fieldfile.storage.exists(name):
+            with fieldfile.storage.open(name, 'rb') as f:
+                manifest = json.loads(f.read().decode('utf-8'))
+        cache.set(key, manifest, timeout=None if manifest else MISSING_MANIFEST_TIMEOUT)
+    return manifest or None
+
+
+def thumbnail_name(name, height, fmt):
+    """Storage name of an admin thumbnail of an original image"""
+    stem, _ = os.path.splitext(name)
+    return f'{stem}.thumb{height}.{FILE_EXTENSIONS[fmt]}'
+
+
+def _thumbnail_cache_key(name, height):
+    return f'portfolio:thumbnail:{name}:{height}'
+
+
+def forget_derivatives(name, derived_names):
+    """
+    Drop the cached manifest and thumbnail names of original ``name``,
+    whose derived files ``derived_names`` are being deleted - the same
+    bytes uploaded again get the same name
+    """
+    keys = [_manifest_cache_key(name)]
+    for derived in derived_names:
+        match = THUMBNAIL_HEIGHT_RE.search(derived)
+        if match:
+            keys.append(_thumbnail_cache_key(name, int(match.group(1))))
+    cache.delete_many(keys)
+
+
+def get_thumbnail(fieldfile, height):
+    """
+    Storage name of a thumbnail of ``fieldfile`` at most ``height`` pixels
+    tall, generating it on first use. Returns None if the original can't
+    be read.
+
+    Thumbnails are named after the original, so replacing a file (which
+    gives it a new name) gets new thumbnails, and content-addressed storage
+    deletes them - and forgets their cached names - together with the
+    original.
+    """
+    if not fieldfile:
+        return None
+    key = _thumbnail_cache_key(fieldfile.name, height)
+    name = cache.get(key)
+    if name is not None:
+        return name
+
+    # Both keep transparency, so the format is known before decoding
+    fmt = 'webp' if 'webp' in get_modern_formats() else 'png'
+    name = thumbnail_name(fieldfile.name, height, fmt)
+    storage = fieldfile.storage
+    if not storage.exists(name):
+        try:
+            with fieldfile.open('rb'):
+                image = Image.open(fieldfile)
+                # JPEG decoders can scale down while decoding
+                image.draft('RGB', (image.width * height // max(image.height, 1), height))
+                image = ImageOps.exif_transpose(image)
+                image.load()
+        except (OSError, ValueError) as exc:
+            logger.warning('Could not generate thumbnail for %s: %s', fieldfile.name, exc)
+            return None
+        image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+        width = max(1, round(image.width * height / image.height))
+        name = _replace(storage, name, _encode(image, width, fmt))
+    cache.set(key, name, timeout=None)
+    return name
+
+
+def image_fields(model):
+    """ImageFields declared on ``model``"""
+    return [field for field in model._meta.fields if isinstance(field, ImageField)]
+
+
+def _has_alpha(image):
+    return (
+        image.mode in ('RGBA', 'LA', 'PA')
+        or (image.mode == 'P' and 'transparency' in image.info)
+    )
+
+
+def _placeholder(image):
+    """Base64 data URI of a tiny copy of ``image``"""
+    # JPEG decoders can scale down while decoding, skipping most of the work
+    image.draft('RGB', (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    image = ImageOps.exif_transpose(image).convert('RGB')
+    image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+
+    fmt = 'webp' if 'webp' in get_modern_formats() else 'jpeg'
+    buffer = BytesIO()
+    image.save(buffer, format=fmt.upper(), quality=PLACEHOLDER_QUALITY)
+    encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+    return f'data:{MIME_TYPES[fmt]};base64,{encoded}'
+
+
+def image_metadata(fileobj):
+    """
+    ``(width, height, placeholder)`` of an image file as displayed (after
+    EXIF rotation). Images with transparency get no placeholder, since it
+    would show through them.
+    """
+    image = Image.open(fileobj)
+    width, height = image.size
+    if image.getexif().get(ExifTags.Base.Orientation) in TRANSPOSED_ORIENTATIONS:
+        width, height = height, width
+    placeholder = '' if _has_alpha(image) else _placeholder(image)
+    return width, height, placeholder
+
+
+def read_image_metadata(fieldfile):
+    """``image_metadata`` of a FieldFile, including uploads not saved yet"""
+    committed = fieldfile._committed
+    fieldfile.open('rb')
+    try:
+        return image_metadata(fieldfile)
+    finally:
+        if committed:
+            fieldfile.close()
+        else:
+            # The upload is still to be written to storage
+            fieldfile.seek(0)
+
+
+def metadata_field_names(model, field_name):
+    """
+    ``(width, height, placeholder)`` field names storing metadata for image
+    field ``field_name``, or None if ``model`` doesn't store any
+    """
+    names = (f'{field_name}_width', f'{field_name}_height', f'{field_name}_placeholder')
+    existing = {field.name for field in model._meta.fields}
+    return names if all(name in existing for name in names) else None
+
+
+def _file_name(value):
+    return getattr(value, 'name', value) or ''
+
+
+class ImageMetadataMixin:
+    """
+    Model mixin that keeps ``<field>_width``, ``<field>_height`` and
+    ``<field>_placeholder`` in step with each ImageField on save
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Names as loaded, to notice files swapped without a new upload
+        instance._loaded_image_names = {
+            field.name: _file_name(instance.__dict__.get(field.attname))
+            for field in image_fields(cls)
+            if field.attname in instance.__dict__
+        }
+        return instance
+
+    def refresh_image_metadata(self, force=False, fields=None):
+        """
+        Recompute metadata for new or changed images (every image with
+        ``force``), optionally only for the image fields named in
+        ``fields``. Returns the names of the fields that were set.
+        """
+        loaded = getattr(self, '_loaded_image_names', {})
+        updated = []
+        for field in image_fields(type(self)):
+            names = metadata_field_names(type(self), field.name)
+            if names is None or field.attname not in self.__dict__:
+                continue
+            if fields is not None and field.name not in fields:
+                continue
+            fieldfile = getattr(self, field.name)
+            width_name, height_name, placeholder_name = names
+
+            if not fieldfile:
+                values = (None, None, '')
+            elif (
+                force
+                or not fieldfile._committed
+                or getattr(self, width_name) is None
+                or loaded.get(field.name) != fieldfile.name
+            ):
+                try:
+                    values = read_image_metadata(fieldfile)
+                except (OSError, ValueError) as exc:
+                    logger.warning('Could not read image metadata for %s: %s', fieldfile.name, exc)
+                    values = (None, None, '')
+            else:
+                continue
+
+            for name, value in zip(names, values):
+                setattr(self, name, value)
+            updated.extend(names)
+        return updated
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        updated = self.refresh_image_metadata(fields=update_fields)
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(updated)
+        super().save(*args, **kwargs)
+        self._loaded_image_names = {
+            field.name: _file_name(self.__dict__[field.attname])
+            for field in image_fields(type(self))
+            if field.attname in self.__dict__
+        }
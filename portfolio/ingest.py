@@ -0,0 +1,88 @@
+"""
+Asynchronous contact submission ingestion.
+
+When the site is served through the ASGI application, the ``contact_ingest``
+view acknowledges a valid submission immediately and hands it to the
+``SubmissionBatcher``, which runs on the server's event loop and writes
+queued submissions with a single ``bulk_create`` per batch. Notifications
+are queued in the same transaction and delivered by the background worker.
+
+Submissions are held in memory for at most ``max_delay`` seconds before
+being written; a process killed inside that window loses them.
+"""
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+
+from .analytics import record_submissions
+from .models import ContactSubmission
+from .notifications import queue_notifications
+
+logger = logging.getLogger(__name__)
+
+
+def write_batch(batch):
+    """Persist a batch of cleaned form data and queue its notifications"""
+    with transaction.atomic():
+        submissions = ContactSubmission.objects.bulk_create(
+            [ContactSubmission(**data) for data in batch]
+        )
+        # bulk_create sends no post_save, so count the batch here
+        record_submissions(submissions)
+        queue_notifications(submissions)
+    return submissions
+
+
+class SubmissionBatcher:
+    """Collects submissions on the event loop and writes them in batches"""
+
+    def __init__(self, batch_size=50, max_delay=0.05):
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.loop = None
+        self.queue = None
+        self.worker = None
+
+    async def submit(self, data):
+        """Queue cleaned form data for the next batch"""
+        self._ensure_worker()
+        await self.queue.put(data)
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop or self.worker is None or self.worker.done():
+            self.loop = loop
+            self.queue = asyncio.Queue()
+            self.worker = loop.create_task(self._run())
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        deadline = self.loop.time() + self.max_delay
+        while len(batch) < self.batch_size:
+            timeout = deadline - self.loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await sync_to_async(write_batch)(batch)
+            except Exception:
+                logger.exception(
+                    'Failed to write %d contact submissions: %r', len(batch), batch
+                )
+
+
+batcher = SubmissionBatcher(
+    batch_size=getattr(settings, 'PORTFOLIO_INGEST_BATCH_SIZE', 50),
+    max_delay=getattr(settings, 'PORTFOLIO_INGEST_MAX_DELAY', 0.05),
+)
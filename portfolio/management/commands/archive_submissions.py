@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from portfolio.archive import (
+    archivable, archive_submissions, get_archive_after_days, get_archive_chunk_size,
+    restore_archive,
+)
+from portfolio.models import SubmissionArchive
+
+
+class Command(BaseCommand):
+    help = 'Move old read contact submissions into compressed archive chunks (or restore them)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Archive read submissions older than this many days '
+                 '(default: PORTFOLIO_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Submissions per archive chunk (default: PORTFOLIO_ARCHIVE_CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many submissions would be archived',
+        )
+        parser.add_argument(
+            '--vacuum',
+            action='store_true',
+            help='Run VACUUM afterwards so the database file shrinks',
+        )
+        parser.add_argument(
+            '--restore',
+            type=int,
+            nargs='+',
+            metavar='ARCHIVE_ID',
+            help='Move the submissions of these archives back to the live table',
+        )
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            self.restore(options['restore'])
+            return
+
+        days = get_archive_after_days() if options['days'] is None else options['days']
+        chunk_size = options['chunk_size'] or get_archive_chunk_size()
+        if days < 0 or chunk_size < 1:
+            raise CommandError('--days must be >= 0 and --chunk-size >= 1')
+
+        queryset = archivable(days=days)
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} read submissions older than {days} days would be archived')
+            return
+
+        moved = chunks = compressed = 0
+        for archive in archive_submissions(queryset, chunk_size):
+            moved += archive.count
+            chunks += 1
+            compressed += len(archive.data)
+            self.stdout.write(f'  {archive}')
+
+        if not chunks:
+            self.stdout.write(f'Nothing to archive (no read submissions older than {days} days)')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'\n✓ Archived {moved} submissions in {chunks} chunks ({compressed:,} bytes compressed)'
+            ))
+        if options['vacuum'] and connection.vendor == 'sqlite':
+            # Deleted rows only free pages inside the file until a VACUUM
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+            self.stdout.write(self.style.SUCCESS('✓ Database vacuumed'))
+
+    def restore(self, archive_ids):
+        archives = SubmissionArchive.objects.in_bulk(archive_ids)
+        for archive_id in archive_ids:
+            archive = archives.get(archive_id)
+            if archive is None:
+                self.stdout.write(self.style.WARNING(f'⚠ No archive with id {archive_id}'))
+                continue
+            restored = restore_archive(archive)
+            self.stdout.write(self.style.SUCCESS(f'✓ Restored {restored} submissions from archive {archive_id}'))
@@ -0,0 +1,169 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from portfolio.models import (
+    Testimonial, Project, ActionPhoto, CompanyLogo,
+    Certification, Experience, ContactSubmission,
+)
+from portfolio.search import search_submissions
+
+INDEXED_MODELS = (
+    Testimonial, Project, ActionPhoto, CompanyLogo,
+    Certification, Experience, ContactSubmission,
+)
+
+
+class Rollback(Exception):
+    """Raised to discard the benchmark data"""
+
+
+def benchmark_queries():
+    """(label, queryset) pairs matching the site's list and admin queries"""
+    return [
+        ('Featured testimonials', Testimonial.objects.filter(featured=True)[:10]),
+        ('Featured projects', Project.objects.filter(featured=True)[:10]),
+        ('Homepage action photos', ActionPhoto.objects.filter(featured_on_homepage=True)[:12]),
+        ('Homepage company logos', CompanyLogo.objects.filter(display_on_homepage=True)[:30]),
+        ('Latest certifications', Certification.objects.all()[:20]),
+        ('Latest experience', Experience.objects.all()[:20]),
+        ('Latest submissions', ContactSubmission.objects.all()[:100]),
+        ('Unread submissions', ContactSubmission.objects.filter(is_read=False)[:100]),
+        ('Inbox', ContactSubmission.objects.filter(is_archived=False)[:100]),
+        ('Inbox search', search_submissions(
+            ContactSubmission.objects.filter(is_archived=False), 'football'
+        )[:100]),
+        ('Academy enquiries', ContactSubmission.objects.filter(interest_type='academy')[:100]),
+    ]
+
+
+def explain(queryset, tag):
+    """
+    Query plan for ``queryset``. The SQL is tagged with a comment so a plan
+    cached before the indexes were dropped is never reused.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql} /* {tag} */', params)
+        return '\n'.join(' '.join(map(str, row)) for row in cursor.fetchall())
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed throwaway rows and show query plans and timings for the indexed '
+        'list queries. All data is rolled back afterwards. Development only '
+        '(requires DEBUG).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            default=100_000,
+            type=int,
+            help='Rows seeded per model (default: 100000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            default=5,
+            type=int,
+            help='Runs per query; the fastest is reported',
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also drop the indexes (inside the same transaction) and re-run',
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            # Seeding holds the database's write lock for the whole run, so
+            # live contact submissions would fail with "database is locked"
+            raise CommandError(
+                'benchmark_queries writes to the default database for the whole '
+                'run - only run it with DEBUG on, against a development copy'
+            )
+        self.repeat = max(1, options['repeat'])
+        try:
+            with transaction.atomic():
+                self.seed(options['rows'])
+                self.run('With indexes')
+                if options['compare']:
+                    self.drop_indexes()
+                    self.run('Without indexes')
+                raise Rollback
+        except Rollback:
+            pass
+        self.stdout.write(self.style.SUCCESS('\n✓ Benchmark data rolled back'))
+
+    def seed(self, rows):
+        """Bulk insert ``rows`` rows into every indexed model"""
+        rng = random.Random(0)
+        today = date.today()
+        started = time.monotonic()
+
+        def build(model, factory):
+            model.objects.bulk_create((factory(i) for i in range(rows)), batch_size=5000)
+
+        # Roughly 1% of rows carry a featured/homepage flag, as on the live site
+        build(Testimonial, lambda i: Testimonial(
+            name=f'Person {i}', role='Coach', company='Club', quote='Great work.',
+            featured=rng.random() < 0.01, order=rng.randint(0, 100),
+        ))
+        build(Project, lambda i: Project(
+            title=f'Project {i}', slug=f'project-{i}', subtitle='Impact',
+            hero_image='projects/benchmark.jpg',
+            featured=rng.random() < 0.01, order=rng.randint(0, 100),
+        ))
+        build(ActionPhoto, lambda i: ActionPhoto(
+            title=f'Photo {i}', image='action_photos/benchmark.jpg',
+            featured_on_homepage=rng.random() < 0.01, order=rng.randint(0, 100),
+        ))
+        build(CompanyLogo, lambda i: CompanyLogo(
+            company_name=f'Company {i}', logo='company_logos/benchmark.png',
+            display_on_homepage=rng.random() < 0.01, order=rng.randint(0, 100),
+        ))
+        build(Certification, lambda i: Certification(
+            name=f'Certificate {i}', issuing_organization='FA',
+            issue_date=today - timedelta(days=rng.randint(0, 3650)), order=rng.randint(0, 100),
+        ))
+        build(Experience, lambda i: Experience(
+            company=f'Club {i}', role='Analyst', description='<p>Work</p>',
+            start_date=today - timedelta(days=rng.randint(0, 3650)), order=rng.randint(0, 100),
+        ))
+        build(ContactSubmission, lambda i: ContactSubmission(
+            name=f'Sender {i}', email=f'sender{i}@example.com', phone='0000000000',
+            subject='Hello', message='Message body',
+            interest_type=rng.choice(['general', 'academy', 'both']),
+            is_read=rng.random() < 0.95,
+        ))
+
+        # Give the planner up-to-date statistics
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Seeded {rows} rows into {len(INDEXED_MODELS)} tables '
+            f'in {time.monotonic() - started:.1f}s'
+        ))
+
+    def drop_indexes(self):
+        # Plain DROP INDEX: SQLite's schema editor refuses to run inside the
+        # transaction that keeps the whole benchmark reversible
+        with connection.cursor() as cursor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+    def run(self, heading):
+        self.stdout.write(f'\n=== {heading} ===')
+        for label, queryset in benchmark_queries():
+            best = float('inf')
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                best = min(best, time.perf_counter() - started)
+            self.stdout.write(self.style.SUCCESS(f'\n{label}: {best * 1000:.2f} ms'))
+            self.stdout.write(explain(queryset, heading))
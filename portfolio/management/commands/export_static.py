@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template.utils import get_app_template_dirs
+from django.test import Client
+from django.urls import reverse
+from portfolio.cache import HOMEPAGE_SECTIONS
+from portfolio.critical_css import get_critical_css
+from portfolio.models import Project, ProjectImage, Testimonial
+
+# Written into the output directory to make the next export incremental
+STATE_FILE = '.export-state.json'
+
+# The exporting client's token would be useless to every visitor
+CSRF_INPUT_RE = re.compile(rb'<input type="hidden" name="csrfmiddlewaretoken" value="[^"]*">')
+
+
+def fingerprint(*querysets):
+    """Digest of every row in ``querysets``; changes whenever the data does"""
+    digest = hashlib.sha256()
+    for queryset in querysets:
+        rows = list(queryset.order_by('pk').values_list())
+        digest.update(json.dumps(rows, cls=DjangoJSONEncoder).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def layout_fingerprint():
+    """
+    Digest of everything pages are rendered with besides their data - the
+    project and app templates, the staticfiles manifest (hashed bundle
+    names) and the inlined critical CSS - so a change re-renders every page
+    """
+    digest = hashlib.sha256()
+    directories = [*settings.TEMPLATES[0]['DIRS'], *get_app_template_dirs('templates')]
+    for directory in directories:
+        for path in sorted(Path(directory).rglob('*.html')):
+            digest.update(str(path).encode('utf-8'))
+            digest.update(path.read_bytes())
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest and staticfiles_storage.exists(manifest):
+        with staticfiles_storage.open(manifest) as f:
+            digest.update(f.read())
+    digest.update(get_critical_css().encode('utf-8'))
+    return digest.hexdigest()
+
+
+def sync_tree(source, destination):
+    """
+    Mirror ``source`` into ``destination``, copying only new or changed files
+    and removing files that no longer exist. Returns (copied, removed).
+    """
+    source, destination = Path(source), Path(destination)
+    copied = removed = 0
+    wanted = set()
+    if source.is_dir():
+        for path in source.rglob('*'):
+            if not path.is_file():
+                continue
+            relative = path.relative_to(source)
+            wanted.add(relative)
+            target = destination / relative
+            stat = path.stat()
+            if target.exists():
+                existing = target.stat()
+                if existing.st_size == stat.st_size and existing.st_mtime == stat.st_mtime:
+                    continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+            copied += 1
+    if destination.is_dir():
+        for path in destination.rglob('*'):
+            if path.is_file() and path.relative_to(destination) not in wanted:
+                path.unlink()
+                removed += 1
+    return copied, removed
+
+
+class Command(BaseCommand):
+    help = (
+        'Render every public page and copy static and media files into a '
+        'directory that can be served by plain file hosting'
+    )
+
+    def add_arguments(self, parser):
+        base_dir = Path(__file__).resolve().parent.parent.parent.parent
+        parser.add_argument(
+            '--output',
+            default=base_dir / 'site',
+            type=Path,
+            help='Directory to write the site to (default: ./site)',
+        )
+        parser.add_argument(
+            '--host',
+            help='Host name to render pages for (default: first ALLOWED_HOSTS entry)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render every page even if its content is unchanged',
+        )
+        parser.add_argument(
+            '--skip-collectstatic',
+            action='store_true',
+            help='Copy STATIC_ROOT as it is instead of running collectstatic first',
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+
+        state_path = output / STATE_FILE
+        previous = {}
+        if state_path.exists() and not options['force']:
+            previous = json.loads(state_path.read_text())
+
+        # Collected first: pages link the hashed bundle names it produces
+        if not options['skip_collectstatic']:
+            call_command('collectstatic', interactive=False, verbosity=0)
+
+        client = Client(HTTP_HOST=options['host'] or self.default_host())
+        layout = layout_fingerprint()
+        pages = {}
+        rendered = 0
+        for path, querysets in self.pages():
+            version = hashlib.sha256(f'{layout}:{fingerprint(*querysets)}'.encode()).hexdigest()
+            pages[path] = version
+            if previous.get(path) == version and self.page_file(output, path).exists():
+                continue
+            self.write_page(client, output, path)
+            rendered += 1
+            self.stdout.write(self.style.SUCCESS(f'✓ Rendered {path}'))
+
+        # Pages of deleted projects
+        for path in set(previous) - set(pages):
+            page_file = self.page_file(output, path)
+            if page_file.exists():
+                page_file.unlink()
+                self.stdout.write(self.style.WARNING(f'✗ Removed {path}'))
+
+        static_copied, static_removed = sync_tree(
+            settings.STATIC_ROOT, output / settings.STATIC_URL.strip('/')
+        )
+        media_copied, media_removed = sync_tree(
+            settings.MEDIA_ROOT, output / settings.MEDIA_URL.strip('/')
+        )
+
+        state_path.write_text(json.dumps(pages, indent=2, sort_keys=True))
+        if not getattr(settings, 'PORTFOLIO_CONTACT_CSRF_EXEMPT', False):
+            self.stdout.write(self.style.WARNING(
+                '⚠ PORTFOLIO_CONTACT_CSRF_EXEMPT is off: the Django app serving '
+                '/contact/ will refuse submissions from the exported pages'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Exported to {output} in {time.monotonic() - started:.2f}s: '
+            f'{rendered}/{len(pages)} pages rendered, '
+            f'{static_copied} static and {media_copied} media files copied, '
+            f'{static_removed + media_removed} stale files removed'
+        ))
+
+    def default_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host and not host.startswith('.') and host != '*':
+                return host
+        raise CommandError('No usable host in ALLOWED_HOSTS - pass --host')
+
+    def pages(self):
+        """(URL path, querysets the page renders) for every public page"""
+        homepage_models = [model for models in HOMEPAGE_SECTIONS.values() for model in models]
+        yield reverse('portfolio:home'), [model.objects.all() for model in homepage_models]
+        yield reverse('portfolio:project_list'), [Project.objects.all()]
+        for project in Project.objects.only('pk', 'slug'):
+            yield project.get_absolute_url(), [
+                Project.objects.filter(pk=project.pk),
+                ProjectImage.objects.filter(project=project),
+                Testimonial.objects.filter(project=project),
+            ]
+
+    def page_file(self, output, path):
+        return output / path.strip('/') / 'index.html'
+
+    def write_page(self, client, output, path):
+        response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f'{path} returned HTTP {response.status_code}')
+        page_file = self.page_file(output, path)
+        page_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a host serving the directory never sees half a page
+        temp_file = page_file.with_name(f'.{page_file.name}.tmp')
+        temp_file.write_bytes(CSRF_INPUT_RE.sub(b'', response.content))
+        os.replace(temp_file, page_file)
@@ -0,0 +1,106 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from portfolio.exports import (
+    ENROLLMENT_INTERESTS, EXPORT_CHUNK_SIZE, EXPORT_FORMATS,
+    archived_export_rows, export_lines,
+)
+from portfolio.models import ContactSubmission
+
+
+class Command(BaseCommand):
+    help = 'Stream academy enrollment leads (or other contact submissions) as CSV or JSON lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=sorted(EXPORT_FORMATS),
+            default='csv',
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write (default: stdout)',
+        )
+        parser.add_argument(
+            '--interest',
+            action='append',
+            choices=[value for value, _ in ContactSubmission.ENROLLMENT_INTERESTS],
+            help='Interest types to include; repeatable (default: academy and both)',
+        )
+        parser.add_argument(
+            '--age-group',
+            action='append',
+            choices=[value for value, _ in ContactSubmission.AGE_GROUPS],
+            help='Only these age groups; repeatable',
+        )
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help='Only submissions from this date on (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--unread',
+            action='store_true',
+            help='Only unread submissions',
+        )
+        parser.add_argument(
+            '--include-archived',
+            action='store_true',
+            help=(
+                'Also include submissions archived out of the inbox and those '
+                'moved into compressed submission archives (listed first)'
+            ),
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Rows fetched from the database at a time',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        queryset = ContactSubmission.objects.filter(
+            interest_type__in=options['interest'] or ENROLLMENT_INTERESTS
+        )
+        if options['age_group']:
+            queryset = queryset.filter(age_group__in=options['age_group'])
+        if options['since']:
+            queryset = queryset.filter(submitted_at__date__gte=options['since'])
+        if options['unread']:
+            queryset = queryset.filter(is_read=False)
+
+        archived = ()
+        if options['include_archived']:
+            archived = archived_export_rows(lambda submission: self.matches(submission, options))
+        else:
+            queryset = queryset.filter(is_archived=False)
+
+        lines = export_lines(queryset, options['format'], options['chunk_size'], archived)
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        # newline='' - the csv module writes its own line endings
+        written = 0
+        with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+            for line in lines:
+                f.write(line)
+                written += 1
+        if options['format'] == 'csv':
+            written -= 1  # header
+        self.stderr.write(self.style.SUCCESS(f'✓ Exported {written} submissions to {options["output"]}'))
+
+    def matches(self, submission, options):
+        """The queryset filters, for submissions read from archive chunks"""
+        if submission.interest_type not in (options['interest'] or ENROLLMENT_INTERESTS):
+            return False
+        if options['age_group'] and submission.age_group not in options['age_group']:
+            return False
+        if options['since'] and timezone.localdate(submission.submitted_at) < options['since']:
+            return False
+        return not (options['unread'] and submission.is_read)
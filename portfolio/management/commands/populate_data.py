@@ -1,16 +1,52 @@
-from django.core.management.base import BaseCommand
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+from portfolio.cache import bump_content_version
+from portfolio.replica import queue_replica_refresh
+from portfolio.richtext import RenderedRichTextMixin
 from portfolio.models import (
     AboutMe, Experience, BombayShark, Certification, CompanyLogo
 )
 from datetime import date
+import json
 import os
 from django.core.files import File
 
+# Fixture sections loaded in bulk mode: (key, model, natural key fields)
+BULK_SECTIONS = [
+    ('experiences', Experience, ('company', 'role')),
+    ('certifications', Certification, ('name',)),
+    ('companies', CompanyLogo, ('company_name',)),
+]
+
+# Singleton sections: (key, model)
+SINGLETON_SECTIONS = [
+    ('about_me', AboutMe),
+    ('bombay_sharks', BombayShark),
+]
+
+BATCH_SIZE = 500
+
 
 class Command(BaseCommand):
     help = 'Populate initial portfolio data for Sumedh Rajarshi'
     
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            help='Bulk-load a JSON or YAML fixture instead of the built-in data',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='With --file, report what would change without writing',
+        )
+    
     def handle(self, *args, **kwargs):
+        if kwargs.get('file'):
+            return self.bulk_load(kwargs['file'], dry_run=kwargs.get('dry_run', False))
+        
         self.stdout.write('Populating portfolio data...')
         
         # Create About Me (if doesn't exist)
@@ -170,3 +206,160 @@ class Command(BaseCommand):
         
         self.stdout.write(self.style.SUCCESS('\n✓ Portfolio data populated successfully!'))
         self.stdout.write(self.style.WARNING('\nNote: Please upload images through the admin panel at /admin/'))
+
+    
+    # ============================================
+    # BULK MODE
+    # ============================================
+    
+    def read_fixture(self, path):
+        """Parse a JSON or YAML fixture file into a dict"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                if path.endswith(('.yaml', '.yml')):
+                    try:
+                        import yaml
+                    except ImportError:
+                        raise CommandError('PyYAML is required for YAML fixtures: pip install pyyaml')
+                    data = yaml.safe_load(f)
+                else:
+                    data = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Could not read fixture {path}: {exc}')
+        
+        if not isinstance(data, dict):
+            raise CommandError('Fixture must be a mapping of section name to data')
+        unknown = set(data) - {key for key, *_ in BULK_SECTIONS + SINGLETON_SECTIONS}
+        if unknown:
+            raise CommandError(f'Unknown fixture sections: {", ".join(sorted(unknown))}')
+        return data
+    
+    def coerce(self, model, entry):
+        """Convert raw fixture values to Python values for ``model``'s fields"""
+        values = {}
+        for name, value in entry.items():
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise CommandError(f'{model.__name__} has no field "{name}"')
+            values[field.attname] = field.to_python(value)
+        return values
+    
+    def swap_files(self, model, values, previous=None):
+        """
+        Count references to the content-addressed files a fixture assigns -
+        fixture names never go through ``storage.save()`` - and, given the
+        ``previous`` values, release the files they replace (``save()``
+        does that itself; bulk writes don't)
+        """
+        for field in model._meta.fields:
+            if not isinstance(field, models.FileField) or not hasattr(field.storage, 'retain'):
+                continue
+            if field.attname not in values:
+                continue
+            name = values[field.attname] or ''
+            old = getattr((previous or {}).get(field.attname), 'name', None) or ''
+            if name == old:
+                continue
+            if name and field.storage.is_addressed(name):
+                size = field.storage.size(name) if field.storage.exists(name) else 0
+                field.storage.retain(name, size)
+            if previous is not None and old:
+                transaction.on_commit(lambda storage=field.storage, old=old: storage.release(old))
+    
+    def bulk_load(self, path, dry_run=False):
+        """
+        Load a fixture, diffing it against existing rows with one query per
+        model and applying all inserts/updates in a single transaction.
+        """
+        data = self.read_fixture(path)
+        self.stdout.write(f'Bulk loading {path}...')
+        
+        with transaction.atomic():
+            for key, model in SINGLETON_SECTIONS:
+                if data.get(key):
+                    self.load_singleton(model, self.coerce(model, data[key]))
+            
+            for key, model, natural_key in BULK_SECTIONS:
+                if key in data:
+                    self.load_rows(model, natural_key, data[key] or [])
+            
+            if dry_run:
+                transaction.set_rollback(True)
+                self.stdout.write(self.style.WARNING('\nDry run - no changes written'))
+                return
+            
+            # Bulk operations bypass model signals
+            transaction.on_commit(bump_content_version)
+            transaction.on_commit(queue_replica_refresh)
+        
+        self.stdout.write(self.style.SUCCESS('\n✓ Fixture loaded successfully!'))
+    
+    def load_singleton(self, model, values):
+        instance = model.objects.first()
+        if instance is None:
+            self.swap_files(model, values)
+            model.objects.create(**values)
+            self.stdout.write(self.style.SUCCESS(f'{model._meta.verbose_name}: created'))
+            return
+        
+        changed = [name for name, value in values.items() if getattr(instance, name) != value]
+        if changed:
+            self.swap_files(model, {name: values[name] for name in changed})
+            for name in changed:
+                setattr(instance, name, values[name])
+            instance.save(update_fields=changed + ['updated_at'])
+        self.stdout.write(f'{model._meta.verbose_name}: {len(changed)} fields updated')
+    
+    def load_rows(self, model, natural_key, entries):
+        existing = {
+            tuple(getattr(obj, name) for name in natural_key): obj
+            for obj in model.objects.all()
+        }
+        
+        to_create, to_update, changed_fields = [], {}, set()
+        now = timezone.now()
+        for entry in entries:
+            values = self.coerce(model, entry)
+            missing = [name for name in natural_key if name not in values]
+            if missing:
+                raise CommandError(f'{model.__name__} entry is missing {", ".join(missing)}: {entry}')
+            
+            key = tuple(values[name] for name in natural_key)
+            obj = existing.get(key)
+            if obj is None:
+                self.swap_files(model, values)
+                obj = model(**values)
+                existing[key] = obj
+                to_create.append(obj)
+                continue
+            
+            changed = [name for name, value in values.items() if getattr(obj, name) != value]
+            if changed:
+                self.swap_files(
+                    model, {name: values[name] for name in changed},
+                    previous={name: getattr(obj, name) for name in changed},
+                )
+                for name in changed:
+                    setattr(obj, name, values[name])
+                # bulk_update() skips auto_now, but section cache keys rely on it
+                obj.updated_at = now
+                changed_fields.update(changed)
+                if obj.pk:
+                    to_update[obj.pk] = obj
+        
+        # bulk_create()/bulk_update() skip save(), which renders rich text
+        if issubclass(model, RenderedRichTextMixin):
+            for obj in [*to_create, *to_update.values()]:
+                obj.render_rich_text()
+            changed_fields.update(model.rendered_fields(changed_fields))
+        
+        model.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        if to_update:
+            model.objects.bulk_update(
+                list(to_update.values()), sorted(changed_fields | {'updated_at'}), batch_size=BATCH_SIZE
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{model._meta.verbose_name_plural}: {len(to_create)} created, '
+            f'{len(to_update)} updated, {len(entries) - len(to_create) - len(to_update)} unchanged'
+        ))
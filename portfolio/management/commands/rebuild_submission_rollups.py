@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from portfolio.analytics import rebuild_rollups
+from portfolio.models import SubmissionDailyCount
+
+
+class Command(BaseCommand):
+    help = 'Recount the enrollment dashboard rollups from live and archived submissions'
+
+    def handle(self, *args, **options):
+        # Deleted submissions stop being counted; archived ones still are
+        counted = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Counted {counted} submissions into {SubmissionDailyCount.objects.count()} daily rollups'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from portfolio.cache import bump_content_version
+from portfolio.replica import get_replica_path, refresh_replica
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the read-only database snapshot served to public pages'
+
+    def handle(self, *args, **options):
+        if not refresh_replica():
+            self.stdout.write(self.style.WARNING(
+                '⚠ PORTFOLIO_READ_REPLICA is not set - public pages read the main database'
+            ))
+            return
+        bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f'✓ Snapshot written to {get_replica_path()}'))
@@ -0,0 +1,71 @@
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from portfolio.tasks import claim_next_task, requeue_stale_tasks, run_task
+
+
+class Command(BaseCommand):
+    help = 'Process queued background tasks (image processing etc.)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling forever',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty',
+        )
+        parser.add_argument(
+            '--max-tasks',
+            type=int,
+            default=0,
+            help='Exit after processing this many tasks (0 = unlimited)',
+        )
+    
+    def handle(self, *args, **options):
+        cache = caches['default']
+        if isinstance(cache, (LocMemCache, DummyCache)):
+            # The worker invalidates cached pages, fragments and manifests
+            # that the web processes only see through a shared cache
+            self.stdout.write(self.style.WARNING(
+                f'⚠ The default cache ({type(cache).__name__}) is local to this '
+                'process: the site will not see processed images until its own '
+                'cache entries expire. Configure a shared cache (e.g. '
+                'FileBasedCache or Memcached) - see DEPLOYMENT.md'
+            ))
+        
+        requeued = requeue_stale_tasks()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'⚠ Requeued {requeued} stale tasks'))
+        
+        processed = 0
+        self.stdout.write('Worker started. Waiting for tasks...')
+        
+        while not options['max_tasks'] or processed < options['max_tasks']:
+            background_task = claim_next_task()
+            if background_task is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+            
+            label = f'{background_task.task} #{background_task.pk}'
+            started = time.monotonic()
+            if run_task(background_task):
+                self.stdout.write(self.style.SUCCESS(
+                    f'✓ {label} in {time.monotonic() - started:.1f}s'
+                ))
+            else:
+                self.stdout.write(self.style.ERROR(
+                    f'✗ {label} failed (attempt {background_task.attempts})'
+                ))
+            processed += 1
+        
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Processed {processed} tasks'))
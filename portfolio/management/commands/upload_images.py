@@ -1,132 +1,251 @@
-from django.core.management.base import BaseCommand
-from django.core.files import File
-from portfolio.models import AboutMe, CompanyLogo, BombayShark, GalleryImage
+import hashlib
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from portfolio.cache import bump_content_version
+from portfolio.images import ensure_derivatives, image_metadata, metadata_field_names
+from portfolio.replica import queue_replica_refresh
+from portfolio.models import AboutMe, CompanyLogo, BombayShark, GalleryImage
+from portfolio.signals import BACKGROUND_IMAGE_MODELS
+from portfolio.tasks import enqueue_derivatives
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif'}
+
+# Profile photo for About Me
+PROFILE_PHOTO = "Mumbai City Fc solo photo original.jpg"
+
+# Individual professional football photos for Bombay Sharks - the
+# Mumbai City FC team photo stays with the Experience timeline
+SHARKS_HERO_CANDIDATES = [
+    "Mumbai city fc solo photo.jpg",
+    "Jaipur Pink Panthers solo photo 1.jpg",
+]
+SHARKS_GALLERY = [
+    "Jaipur Pink Panthers solo photo 2.jpg",
+    "Mumbai City Fc old photo with trophy.jpg",
+]
+
+
+def normalize_name(name):
+    """'Hyperlink logo.png' and 'Hyperlink' both become 'hyperlink'"""
+    stem = os.path.splitext(name)[0].lower()
+    stem = re.sub(r'\blogo\b', '', stem)
+    return re.sub(r'[^a-z0-9]', '', stem)
+
+
+def file_digest(fileobj):
+    """SHA-256 of a file object, read in chunks"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
 
 class Command(BaseCommand):
-    help = 'Upload images from Personal Photos and Logos folders to database'
-    
-    def handle(self, *args, **kwargs):
+    help = 'Import images from the Logos and Personal Photos folders, skipping unchanged files'
+
+    def add_arguments(self, parser):
         base_dir = Path(__file__).resolve().parent.parent.parent.parent
-        
-        # Upload profile photo
-        self.upload_profile_photo(base_dir)
-        
-        # Upload company logos
-        self.upload_company_logos(base_dir)
-        
-        # Upload Bombay Sharks hero image
-        self.upload_bombay_sharks_images(base_dir)
-        
-        self.stdout.write(self.style.SUCCESS('\n✓ All images uploaded successfully!'))
-    
-    def upload_profile_photo(self, base_dir):
-        """Upload profile photo to About Me"""
-        photos_dir = base_dir / "Personal Photos"
-        
-        # Use the original photo as specified by user
-        profile_photo_path = photos_dir / "Mumbai City Fc solo photo original.jpg"
-        
-        if profile_photo_path.exists():
-            about_me = AboutMe.objects.first()
-            if about_me:
-                with open(profile_photo_path, 'rb') as f:
-                    about_me.profile_photo.save(
-                        profile_photo_path.name,
-                        File(f),
-                        save=True
-                    )
-                self.stdout.write(self.style.SUCCESS(f'✓ Uploaded profile photo: {profile_photo_path.name}'))
+        parser.add_argument(
+            '--logos',
+            default=base_dir / 'Logos',
+            type=Path,
+            help='Directory of company logos, matched to companies by file name',
+        )
+        parser.add_argument(
+            '--photos',
+            default=base_dir / 'Personal Photos',
+            type=Path,
+            help='Directory containing the profile and Bombay Sharks photos',
+        )
+        parser.add_argument(
+            '--workers',
+            default=min(8, os.cpu_count() or 1),
+            type=int,
+            help='Number of files processed in parallel',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-upload files even if their content is unchanged',
+        )
+
+    def handle(self, *args, **options):
+        self.force = options['force']
+
+        # Each job is (instance, image field name, source path). Planning
+        # touches the database; the thread pool only does file work.
+        jobs = self.plan_company_logos(options['logos'])
+        jobs += self.plan_profile_photo(options['photos'])
+        jobs += self.plan_bombay_sharks_images(options['photos'])
+
+        started = time.monotonic()
+        workers = max(1, options['workers'])
+
+        # Reading and hashing is the bulk of a re-import - do it in parallel
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            checks = list(pool.map(self.is_changed, jobs))
+        changed = [job for job, (is_changed, _) in zip(jobs, checks) if is_changed]
+
+        # Storage writes stay on this thread: the storage may record
+        # references in the database
+        uploaded = [(job, self.upload(job)) for job in changed]
+        created = set()
+        with transaction.atomic():
+            for (instance, field_name, path), name in uploaded:
+                # Plain UPDATE - derivatives are handled below and the page
+                # cache is invalidated once for the whole batch. updated_at
+                # keys the cached section fragments that embed the image
+                values = {
+                    field_name: name,
+                    'updated_at': timezone.now(),
+                    **self.read_metadata(instance, field_name, path),
+                }
+                if instance.pk is None:
+                    # New gallery rows are only inserted once their file is
+                    # stored, so an interrupted run leaves no imageless rows
+                    for attname, value in values.items():
+                        setattr(instance, attname, value)
+                    type(instance).objects.bulk_create([instance])
+                    created.add(instance)
+                    continue
+                type(instance).objects.filter(pk=instance.pk).update(**values)
+                for attname, value in values.items():
+                    if attname != field_name:
+                        setattr(instance, attname, value)
+
+        for (instance, field_name, path), name in uploaded:
+            self.stdout.write(self.style.SUCCESS(f'✓ Uploaded {path.name} → {name}'))
+            if instance in created:
+                self.stdout.write(self.style.SUCCESS(f'✓ Added gallery image: {instance.caption}'))
+                continue
+            fieldfile = getattr(instance, field_name)
+            if fieldfile and hasattr(fieldfile.storage, 'release'):
+                # Drop the replaced file's reference (content-addressed storage)
+                fieldfile.storage.release(fieldfile.name)
+            fieldfile.name = name
+
+        # Gallery models go to the background worker, the rest are resized here
+        inline = []
+        for instance, field_name, path in changed:
+            if type(instance) in BACKGROUND_IMAGE_MODELS:
+                enqueue_derivatives(instance, field_name)
             else:
-                self.stdout.write(self.style.WARNING('⚠ About Me entry not found'))
-        else:
-            self.stdout.write(self.style.WARNING(f'⚠ Profile photo not found: {profile_photo_path}'))
-    
-    def upload_company_logos(self, base_dir):
-        """Upload company logos"""
-        logos_dir = base_dir / "Logos"
-        
-        # Mapping of company names to logo files
-        logo_mapping = {
-            "Bombay Sharks": "Bombay Sharks.jpg",
-            "Hyperlink": "Hyperlink logo.png",
-            "India Khelo Football": "India Khelo Football Logo.png",
-            "Jaipur Pink Panthers": "Jaipur Pink Panthers Logo.png",
-            "Mumbai City FC": "Mumbai City FC Logo.jpg",
-            "Mumbai Cricket Association": "Mumbai Cricket Association Logo.png",
-            "Pro Govinda": "Pro Govinda Logo.jpg",
-            "Rajasthan Royals": "Rajasthan Royals logo.jpg",
-            "Reckoning eSports": "Reckoning eSports logo.jpg",
-            "SportVot": "SportVot logo.png",
-            "SportsTiger": "SportsTiger logo.jpg",
-            "Ultimate Table Tennis": "Ultimate Table Tennis Logo.jpg",
-            "Para Football": "para football logo.png",
-        }
-        
-        for company_name, logo_filename in logo_mapping.items():
-            logo_path = logos_dir / logo_filename
-            
-            if logo_path.exists():
-                try:
-                    company = CompanyLogo.objects.get(company_name=company_name)
-                    with open(logo_path, 'rb') as f:
-                        company.logo.save(
-                            logo_filename,
-                            File(f),
-                            save=True
-                        )
-                    self.stdout.write(self.style.SUCCESS(f'✓ Uploaded logo for {company_name}'))
-                except CompanyLogo.DoesNotExist:
-                    self.stdout.write(self.style.WARNING(f'⚠ Company not found: {company_name}'))
+                inline.append(getattr(instance, field_name))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda fieldfile: ensure_derivatives(fieldfile, force=True), inline))
+
+        if uploaded:
+            bump_content_version()
+            queue_replica_refresh()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        total_bytes = sum(size for _, size in checks)
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ {len(jobs)} files scanned, {len(uploaded)} uploaded, '
+            f'{len(jobs) - len(uploaded)} unchanged in {elapsed:.2f}s '
+            f'({len(jobs) / elapsed:.1f} files/s, {total_bytes / elapsed / 1024 / 1024:.1f} MB/s)'
+        ))
+
+    def is_changed(self, job):
+        """
+        Whether ``path`` differs from the file currently stored in the
+        field. Returns (changed, bytes in source file).
+        """
+        instance, field_name, path = job
+        fieldfile = getattr(instance, field_name)
+        storage = fieldfile.storage
+        size = path.stat().st_size
+
+        if self.force or not fieldfile or not storage.exists(fieldfile.name):
+            return True, size
+        # Sizes differ → changed; otherwise compare content hashes
+        if storage.size(fieldfile.name) != size:
+            return True, size
+        with open(path, 'rb') as f, storage.open(fieldfile.name, 'rb') as stored:
+            return file_digest(stored) != file_digest(f), size
+
+    def upload(self, job):
+        """Save ``path`` to the field's storage and return the stored name"""
+        instance, field_name, path = job
+        field = instance._meta.get_field(field_name)
+        with open(path, 'rb') as f:
+            return field.storage.save(field.generate_filename(instance, path.name), File(f))
+
+    def read_metadata(self, instance, field_name, path):
+        """Stored dimensions and placeholder for ``path``, if the model keeps them"""
+        names = metadata_field_names(type(instance), field_name)
+        if names is None:
+            return {}
+        try:
+            with open(path, 'rb') as f:
+                return dict(zip(names, image_metadata(f)))
+        except (OSError, ValueError) as exc:
+            self.stdout.write(self.style.WARNING(f'⚠ Could not read {path.name}: {exc}'))
+            return {}
+
+    def plan_company_logos(self, logos_dir):
+        """Match every image in ``logos_dir`` to a company by normalized name"""
+        if not logos_dir.is_dir():
+            self.stdout.write(self.style.WARNING(f'⚠ Logos directory not found: {logos_dir}'))
+            return []
+
+        companies = {normalize_name(c.company_name): c for c in CompanyLogo.objects.all()}
+        jobs = []
+        for path in sorted(logos_dir.iterdir()):
+            if path.suffix.lower() not in IMAGE_EXTENSIONS:
+                continue
+            company = companies.get(normalize_name(path.name))
+            if company:
+                jobs.append((company, 'logo', path))
             else:
-                self.stdout.write(self.style.WARNING(f'⚠ Logo not found: {logo_path}'))
-    
-    def upload_bombay_sharks_images(self, base_dir):
-        """Upload Bombay Sharks hero image and gallery"""
-        photos_dir = base_dir / "Personal Photos"
-        
+                self.stdout.write(self.style.WARNING(f'⚠ No company matches logo: {path.name}'))
+        return jobs
+
+    def plan_profile_photo(self, photos_dir):
+        """Profile photo for About Me"""
+        profile_photo_path = photos_dir / PROFILE_PHOTO
+        if not profile_photo_path.exists():
+            self.stdout.write(self.style.WARNING(f'⚠ Profile photo not found: {profile_photo_path}'))
+            return []
+
+        about_me = AboutMe.objects.first()
+        if not about_me:
+            self.stdout.write(self.style.WARNING('⚠ About Me entry not found'))
+            return []
+        return [(about_me, 'profile_photo', profile_photo_path)]
+
+    def plan_bombay_sharks_images(self, photos_dir):
+        """Bombay Sharks hero image and gallery"""
         sharks = BombayShark.objects.first()
         if not sharks:
             self.stdout.write(self.style.WARNING('⚠ Bombay Sharks Academy entry not found'))
-            return
-        
-        # Use individual professional football photos for Bombay Sharks
-        # Mumbai City FC team photo should stay with Experience timeline
-        hero_candidates = [
-            "Mumbai city fc solo photo.jpg",
-            "Jaipur Pink Panthers solo photo 1.jpg",
-        ]
-        
-        for candidate in hero_candidates:
+            return []
+
+        jobs = []
+        # A hero chosen in the admin is only replaced with --force
+        for candidate in SHARKS_HERO_CANDIDATES:
             hero_path = photos_dir / candidate
-            if hero_path.exists() and not sharks.hero_image:
-                with open(hero_path, 'rb') as f:
-                    sharks.hero_image.save(
-                        candidate,
-                        File(f),
-                        save=True
-                    )
-                self.stdout.write(self.style.SUCCESS(f'✓ Uploaded Bombay Sharks hero image: {candidate}'))
+            if hero_path.exists() and (self.force or not sharks.hero_image):
+                jobs.append((sharks, 'hero_image', hero_path))
                 break
-        
-        # Add professional action/training photos to gallery (not team photos)
-        gallery_photos = [
-            "Jaipur Pink Panthers solo photo 2.jpg",
-            "Mumbai City Fc old photo with trophy.jpg",
-        ]
-        
-        for photo_name in gallery_photos:
+
+        existing = {image.caption: image for image in sharks.gallery_images.all()}
+        for photo_name in SHARKS_GALLERY:
             photo_path = photos_dir / photo_name
-            if photo_path.exists():
-                # Check if already exists
-                if not GalleryImage.objects.filter(academy=sharks, caption=photo_name).exists():
-                    gallery_img = GalleryImage(academy=sharks, caption=photo_name.replace('.jpg', ''))
-                    with open(photo_path, 'rb') as f:
-                        gallery_img.image.save(
-                            photo_name,
-                            File(f),
-                            save=True
-                        )
-                    self.stdout.write(self.style.SUCCESS(f'✓ Added gallery image: {photo_name}'))
+            if not photo_path.exists():
+                continue
+            caption = photo_path.stem
+            gallery_img = existing.get(caption)
+            if gallery_img is None:
+                # Saved with its file once the upload succeeds
+                gallery_img = GalleryImage(academy=sharks, caption=caption)
+            jobs.append((gallery_img, 'image', photo_path))
+        return jobs
@@ -0,0 +1,206 @@
+"""
+Serve collected static files and uploaded media from the Django process.
+
+``StaticMediaMiddleware`` answers requests under ``STATIC_URL`` and
+``MEDIA_URL`` before the rest of the stack runs, so the site does not
+depend on host-specific static file mappings. Responses are streamed with
+``FileResponse`` (``sendfile`` where the server supports it) and support:
+
+- ``ETag``/``Last-Modified`` validators and ``304 Not Modified``
+- single byte ranges (``206 Partial Content``), e.g. for the resume PDF
+- pre-compressed ``.br``/``.gz`` siblings written by ``collectstatic``
+- year-long immutable caching for fingerprinted and content-addressed names
+
+Enabled by ``PORTFOLIO_SERVE_FILES`` (on when DEBUG is off).
+"""
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .storage import CONTENT_PREFIX
+
+# ManifestStaticFilesStorage names: css/site.22251a9fd128.css
+FINGERPRINT_RE = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Encodings in order of preference: (Accept-Encoding token, file suffix)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+CHUNK_SIZE = 64 * 1024
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts (ignoring those with q=0)"""
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        token, _, params = item.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single-range ``Range`` header, inclusive, or None to
+    serve the whole file. Raises ValueError for unsatisfiable ranges.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Multiple or malformed ranges: a full response is always allowed
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def iter_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+class StaticMediaMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PORTFOLIO_SERVE_FILES', not settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # (URL prefix, directory); STATIC_URL may be relative ("static/")
+        self.roots = [
+            ('/' + url.strip('/') + '/', os.fspath(root))
+            for url, root in (
+                (settings.STATIC_URL, settings.STATIC_ROOT),
+                (settings.MEDIA_URL, settings.MEDIA_ROOT),
+            )
+            if url and root
+        ]
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD'):
+            for prefix, root in self.roots:
+                if request.path.startswith(prefix):
+                    response = self.serve(request, root, request.path[len(prefix):])
+                    if response is not None:
+                        return response
+        return self.get_response(request)
+
+    def find(self, root, name):
+        """(path, os.stat_result) of a regular file under ``root``, or None"""
+        if not name or any(part.startswith('.') for part in name.split('/')):
+            return None
+        try:
+            path = safe_join(root, name)
+            info = os.stat(path)
+        except (SuspiciousFileOperation, OSError, ValueError):
+            return None
+        if not stat.S_ISREG(info.st_mode):
+            return None
+        return path, info
+
+    def serve(self, request, root, name):
+        found = self.find(root, name)
+        if found is None:
+            return None
+        path, info = found
+        content_type, _ = mimetypes.guess_type(path)
+        content_type = content_type or 'application/octet-stream'
+
+        # Ranges are defined on the identity encoding, so never compress them
+        range_header = request.META.get('HTTP_RANGE')
+        encoding = None
+        if not range_header:
+            accepted = accepted_encodings(request)
+            for token, suffix in ENCODINGS:
+                if token in accepted:
+                    sibling = self.find(root, name + suffix)
+                    if sibling is not None:
+                        encoding, (path, info) = token, sibling
+                        break
+
+        etag = f'"{info.st_size:x}-{info.st_mtime_ns:x}{"-" + encoding if encoding else ""}"'
+        last_modified = int(info.st_mtime)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.file_response(request, path, info, etag, last_modified, range_header)
+            if encoding:
+                response['Content-Encoding'] = encoding
+            if response.status_code in (200, 206):
+                response['Content-Type'] = content_type
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        if any(self.find(root, name + suffix) for _, suffix in ENCODINGS):
+            response['Vary'] = 'Accept-Encoding'
+        if FINGERPRINT_RE.search(name) or name.startswith(CONTENT_PREFIX + '/'):
+            response['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        return response
+
+    def file_response(self, request, path, info, etag, last_modified, range_header):
+        size = info.st_size
+        byte_range = None
+        if range_header and self.if_range_matches(request, etag, last_modified):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+
+        if byte_range is None:
+            start, length, status = 0, size, 200
+        else:
+            start, end = byte_range
+            length, status = end - start + 1, 206
+
+        if request.method == 'HEAD':
+            response = HttpResponse(status=status)
+        elif status == 200:
+            # FileResponse lets the server use sendfile / wsgi.file_wrapper
+            response = FileResponse(open(path, 'rb'))
+            # Served inline under the requested name, not the .br/.gz file's
+            if response.has_header('Content-Disposition'):
+                del response['Content-Disposition']
+        else:
+            response = StreamingHttpResponse(iter_range(path, start, length), status=status)
+        if status == 206:
+            response['Content-Range'] = f'bytes {start}-{start + length - 1}/{size}'
+        response['Content-Length'] = str(length)
+        return response
+
+    def if_range_matches(self, request, etag, last_modified):
+        """Whether a Range request should be honoured given ``If-Range``"""
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            return if_range == etag
+        return parse_http_date_safe(if_range) == last_modified
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-17 15:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_storedfile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testimonial',
+            name='project',
+            field=models.ForeignKey(blank=True, help_text="Show on this project's case study page", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='testimonials', to='portfolio.project'),
+        ),
+    ]
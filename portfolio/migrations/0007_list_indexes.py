@@ -0,0 +1,65 @@
+# Generated by Django 5.1.3 on 2026-10-17 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_testimonial_project'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='actionphoto',
+            index=models.Index(fields=['order', '-id'], name='actionphoto_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionphoto',
+            index=models.Index(condition=models.Q(('featured_on_homepage', True)), fields=['order', '-id'], name='actionphoto_homepage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['-issue_date', 'order'], name='certification_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companylogo',
+            index=models.Index(fields=['order', 'company_name'], name='companylogo_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companylogo',
+            index=models.Index(condition=models.Q(('display_on_homepage', True)), fields=['order', 'company_name'], name='companylogo_homepage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(fields=['-submitted_at'], name='submission_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(fields=['interest_type', '-submitted_at'], name='submission_interest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['-submitted_at'], name='submission_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['-start_date', 'order'], name='experience_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['order', '-created_at'], name='project_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('featured', True)), fields=['order', '-created_at'], name='project_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['order', '-created_at'], name='testimonial_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(condition=models.Q(('featured', True)), fields=['order', '-created_at'], name='testimonial_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.3 on 2026-10-17 16:02
+
+import portfolio.richtext
+from django.db import migrations
+from portfolio.richtext import sanitize_html, truncate_html
+
+# Historical models don't carry the mixin's declarations
+RENDERED = {
+    'AboutMe': {'bio': 'bio_html'},
+    'Experience': {'description': 'description_html'},
+    'BombayShark': {
+        'description': 'description_html',
+        'training_philosophy': 'training_philosophy_html',
+    },
+    'Project': {
+        'problem': 'problem_html',
+        'solution': 'solution_html',
+        'impact': 'impact_html',
+    },
+}
+
+
+def render_existing(apps, schema_editor):
+    for model_name, fields in RENDERED.items():
+        model = apps.get_model('portfolio', model_name)
+        objects = list(model.objects.all())
+        for obj in objects:
+            for source, target in fields.items():
+                setattr(obj, target, sanitize_html(getattr(obj, source)))
+            if model_name == 'BombayShark':
+                obj.training_philosophy_summary_html = truncate_html(obj.training_philosophy_html, 30)
+        targets = list(fields.values())
+        if model_name == 'BombayShark':
+            targets.append('training_philosophy_summary_html')
+        model.objects.bulk_update(objects, targets)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutme',
+            name='bio_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='bombayshark',
+            name='description_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='bombayshark',
+            name='training_philosophy_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='bombayshark',
+            name='training_philosophy_summary_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='description_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='impact_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='problem_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='solution_html',
+            field=portfolio.richtext.SanitizedHTMLField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.3 on 2026-10-17 16:07
+
+from django.db import migrations, models
+
+# External-content FTS5 index over the submission text; the triggers keep
+# it in sync with every insert, edit and delete (bulk ones included)
+CREATE_FTS = [
+    """
+    CREATE VIRTUAL TABLE portfolio_contactsubmission_fts USING fts5(
+        name, email, subject, message,
+        content='portfolio_contactsubmission', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER portfolio_contactsubmission_fts_insert
+    AFTER INSERT ON portfolio_contactsubmission BEGIN
+        INSERT INTO portfolio_contactsubmission_fts(rowid, name, email, subject, message)
+        VALUES (new.id, new.name, new.email, new.subject, new.message);
+    END
+    """,
+    """
+    CREATE TRIGGER portfolio_contactsubmission_fts_delete
+    AFTER DELETE ON portfolio_contactsubmission BEGIN
+        INSERT INTO portfolio_contactsubmission_fts(portfolio_contactsubmission_fts, rowid, name, email, subject, message)
+        VALUES ('delete', old.id, old.name, old.email, old.subject, old.message);
+    END
+    """,
+    """
+    CREATE TRIGGER portfolio_contactsubmission_fts_update
+    AFTER UPDATE OF name, email, subject, message ON portfolio_contactsubmission BEGIN
+        INSERT INTO portfolio_contactsubmission_fts(portfolio_contactsubmission_fts, rowid, name, email, subject, message)
+        VALUES ('delete', old.id, old.name, old.email, old.subject, old.message);
+        INSERT INTO portfolio_contactsubmission_fts(rowid, name, email, subject, message)
+        VALUES (new.id, new.name, new.email, new.subject, new.message);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO portfolio_contactsubmission_fts(portfolio_contactsubmission_fts) VALUES ('rebuild')",
+]
+
+DROP_FTS = [
+    'DROP TRIGGER IF EXISTS portfolio_contactsubmission_fts_insert',
+    'DROP TRIGGER IF EXISTS portfolio_contactsubmission_fts_delete',
+    'DROP TRIGGER IF EXISTS portfolio_contactsubmission_fts_update',
+    'DROP TABLE IF EXISTS portfolio_contactsubmission_fts',
+]
+
+
+def run_sqlite(statements):
+    # Other backends fall back to icontains search (portfolio.search)
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        with schema_editor.connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactsubmission',
+            name='is_archived',
+            field=models.BooleanField(default=False, help_text='Hidden from the inbox'),
+        ),
+        migrations.AddIndex(
+            model_name='contactsubmission',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['-submitted_at'], name='submission_inbox_idx'),
+        ),
+        migrations.RunPython(run_sqlite(CREATE_FTS), run_sqlite(DROP_FTS)),
+    ]
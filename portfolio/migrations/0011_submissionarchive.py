@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-17 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_submission_inbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_submitted_at', models.DateTimeField()),
+                ('last_submitted_at', models.DateTimeField()),
+                ('count', models.PositiveIntegerField()),
+                ('data', models.BinaryField(help_text='gzip-compressed JSON lines, one submission per line')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Submission Archive',
+                'verbose_name_plural': 'Submission Archives',
+                'ordering': ['-last_submitted_at'],
+                'indexes': [models.Index(fields=['first_submitted_at', 'last_submitted_at'], name='archive_range_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.3 on 2026-10-17 16:16
+
+import gzip
+import json
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+# Self-contained copy of portfolio.analytics.count_submissions as of this
+# migration, so later changes to that module can't alter history
+def count_existing(apps, schema_editor):
+    ContactSubmission = apps.get_model('portfolio', 'ContactSubmission')
+    SubmissionArchive = apps.get_model('portfolio', 'SubmissionArchive')
+    SubmissionDailyCount = apps.get_model('portfolio', 'SubmissionDailyCount')
+
+    counts = Counter()
+    grouped = ContactSubmission.objects.annotate(day=TruncDate('submitted_at')).values_list(
+        'day', 'interest_type', 'age_group'
+    ).annotate(n=Count('pk')).order_by()
+    for day, interest_type, age_group, n in grouped:
+        counts[(day, interest_type, age_group)] += n
+    for archive in SubmissionArchive.objects.iterator(chunk_size=1):
+        # gzip-compressed JSON lines, one submission per line
+        for line in gzip.decompress(bytes(archive.data)).decode('utf-8').splitlines():
+            row = json.loads(line)
+            day = timezone.localdate(parse_datetime(row['submitted_at']))
+            counts[(day, row['interest_type'], row['age_group'])] += 1
+
+    SubmissionDailyCount.objects.bulk_create([
+        SubmissionDailyCount(day=day, interest_type=interest_type, age_group=age_group, count=n)
+        for (day, interest_type, age_group), n in counts.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0011_submissionarchive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('interest_type', models.CharField(choices=[('general', 'General Inquiry'), ('academy', 'Academy Enrollment'), ('both', 'Both')], max_length=20)),
+                ('age_group', models.CharField(blank=True, choices=[('U6', 'Under 6'), ('U8', 'Under 8'), ('U10', 'Under 10'), ('U12', 'Under 12'), ('U15', 'Under 15'), ('other', 'Other')], max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Submission Daily Count',
+                'verbose_name_plural': 'Submission Daily Counts',
+                'ordering': ['-day', 'interest_type', 'age_group'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'interest_type', 'age_group'), name='submission_rollup_key')],
+            },
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+    ]
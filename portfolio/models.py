@@ -1,7 +1,12 @@
 from django.db import models
+from django.urls import reverse
+from django.utils import timezone
 from django.core.validators import EmailValidator, URLValidator, MinValueValidator, MaxValueValidator
 from ckeditor.fields import RichTextField
 
+from .images import ImageMetadataMixin
+from .richtext import RenderedRichTextMixin, SanitizedHTMLField
+
 # ============================================
 # NEW MODELS FOR VISUAL STORYTELLING REDESIGN
 # ============================================
@@ -30,11 +35,26 @@ class Testimonial(models.Model):
         default=False,
         help_text="Show on homepage"
     )
+    project = models.ForeignKey(
+        'Project',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='testimonials',
+        help_text="Show on this project's case study page"
+    )
     order = models.IntegerField(default=0, help_text="Display order (lower = first)")
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at'], name='testimonial_order_idx'),
+            models.Index(
+                fields=['order', '-created_at'], condition=models.Q(featured=True),
+                name='testimonial_featured_idx'
+            ),
+        ]
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
     
@@ -42,7 +62,7 @@ class Testimonial(models.Model):
         return f"{self.name} - {self.company}"
 
 
-class Project(models.Model):
+class Project(RenderedRichTextMixin, models.Model):
     """Case studies/projects showcasing impact"""
     title = models.CharField(max_length=200, help_text="e.g., 'Revolutionizing Youth Scouting'")
     slug = models.SlugField(unique=True, help_text="URL-friendly version")
@@ -64,6 +84,10 @@ class Project(models.Model):
         blank=True,
         help_text="THE IMPACT - Results with numbers/data"
     )
+    # Sanitized copies rendered on save - see portfolio.richtext
+    problem_html = SanitizedHTMLField()
+    solution_html = SanitizedHTMLField()
+    impact_html = SanitizedHTMLField()
     
     # Visual Content
     hero_image = models.ImageField(
@@ -84,19 +108,35 @@ class Project(models.Model):
     order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    rendered_rich_text = {
+        'problem': 'problem_html',
+        'solution': 'solution_html',
+        'impact': 'impact_html',
+    }
+    
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at'], name='project_order_idx'),
+            models.Index(
+                fields=['order', '-created_at'], condition=models.Q(featured=True),
+                name='project_featured_idx'
+            ),
+        ]
         verbose_name = "Project / Case Study"
         verbose_name_plural = "Projects / Case Studies"
     
     def __str__(self):
         return self.title
     
+    def get_absolute_url(self):
+        return reverse('portfolio:project_detail', kwargs={'slug': self.slug})
+    
     def get_tags_list(self):
         return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
 
 
-class ProjectImage(models.Model):
+class ProjectImage(ImageMetadataMixin, models.Model):
     """Gallery images for projects"""
     project = models.ForeignKey(
         Project,
@@ -107,6 +147,10 @@ class ProjectImage(models.Model):
         upload_to='projects/gallery/',
         help_text="Project gallery image"
     )
+    # Displayed size and blurred placeholder, set on save - see portfolio.images
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     caption = models.CharField(max_length=200, blank=True)
     order = models.IntegerField(default=0)
     
@@ -119,7 +163,7 @@ class ProjectImage(models.Model):
         return f"{self.project.title} - Image {self.order}"
 
 
-class ActionPhoto(models.Model):
+class ActionPhoto(ImageMetadataMixin, models.Model):
     """Action photos for visual storytelling throughout site"""
     CATEGORY_CHOICES = [
         ('coaching', 'Coaching/Training'),
@@ -135,6 +179,10 @@ class ActionPhoto(models.Model):
         upload_to='action_photos/',
         help_text="High-quality action photo"
     )
+    # Displayed size and blurred placeholder, set on save - see portfolio.images
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     category = models.CharField(
         max_length=20,
         choices=CATEGORY_CHOICES,
@@ -146,6 +194,13 @@ class ActionPhoto(models.Model):
     
     class Meta:
         ordering = ['order', '-id']
+        indexes = [
+            models.Index(fields=['order', '-id'], name='actionphoto_order_idx'),
+            models.Index(
+                fields=['order', '-id'], condition=models.Q(featured_on_homepage=True),
+                name='actionphoto_homepage_idx'
+            ),
+        ]
         verbose_name = "Action Photo"
         verbose_name_plural = "Action Photos"
     
@@ -157,13 +212,14 @@ class ActionPhoto(models.Model):
 # EXISTING MODELS (ENHANCED)
 # ============================================
 
-class AboutMe(models.Model):
+class AboutMe(RenderedRichTextMixin, models.Model):
     """
     Singleton model for About Me section - only one instance should exist
     """
     name = models.CharField(max_length=200)
     title = models.CharField(max_length=200, help_text="Professional title/role")
     bio = RichTextField(help_text="Professional summary and background")
+    bio_html = SanitizedHTMLField()
     profile_photo = models.ImageField(upload_to='profile/', help_text="Your professional photo")
     email = models.EmailField(validators=[EmailValidator()])
     phone = models.CharField(max_length=20, blank=True)
@@ -179,6 +235,8 @@ class AboutMe(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    rendered_rich_text = {'bio': 'bio_html'}
+    
     class Meta:
         verbose_name = "About Me"
         verbose_name_plural = "About Me"
@@ -193,7 +251,7 @@ class AboutMe(models.Model):
         return super().save(*args, **kwargs)
 
 
-class Experience(models.Model):
+class Experience(RenderedRichTextMixin, models.Model):
     """
     Work experience entries
     """
@@ -202,6 +260,7 @@ class Experience(models.Model):
     start_date = models.DateField()
     end_date = models.DateField(null=True, blank=True, help_text="Leave blank if current position")
     description = RichTextField(help_text="Job responsibilities and achievements")
+    description_html = SanitizedHTMLField()
     company_logo = models.ImageField(upload_to='experiences/', blank=True)
     is_current = models.BooleanField(default=False, help_text="Currently working here")
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
@@ -209,8 +268,13 @@ class Experience(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    rendered_rich_text = {'description': 'description_html'}
+    
     class Meta:
         ordering = ['-start_date', 'order']
+        indexes = [
+            models.Index(fields=['-start_date', 'order'], name='experience_order_idx'),
+        ]
         verbose_name = "Experience"
         verbose_name_plural = "Experiences"
     
@@ -218,7 +282,7 @@ class Experience(models.Model):
         return f"{self.role} at {self.company}"
 
 
-class BombayShark(models.Model):
+class BombayShark(RenderedRichTextMixin, models.Model):
     """
     Bombay Sharks Football Academy section - singleton model
     """
@@ -226,15 +290,25 @@ class BombayShark(models.Model):
     subtitle = models.CharField(max_length=300, default="Founder | May 2025 - Present")
     hero_image = models.ImageField(upload_to='bombay_sharks/', help_text="Main academy photo")
     description = RichTextField(help_text="Academy details and philosophy")
+    description_html = SanitizedHTMLField()
     
     # Academy details
     age_groups = models.CharField(max_length=100, default="U-6 to U-15")
     locations = models.TextField(help_text="Operating locations across Mumbai")
     training_philosophy = RichTextField(help_text="Training approach and methodology")
+    training_philosophy_html = SanitizedHTMLField()
+    training_philosophy_summary_html = SanitizedHTMLField()
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    rendered_rich_text = {
+        'description': 'description_html',
+        'training_philosophy': 'training_philosophy_html',
+    }
+    # Shown on the home page card
+    truncated_rich_text = {'training_philosophy_summary_html': ('training_philosophy', 30)}
+    
     class Meta:
         verbose_name = "Bombay Sharks Academy"
         verbose_name_plural = "Bombay Sharks Academy"
@@ -248,16 +322,21 @@ class BombayShark(models.Model):
         return super().save(*args, **kwargs)
 
 
-class GalleryImage(models.Model):
+class GalleryImage(ImageMetadataMixin, models.Model):
     """
     Gallery images for Bombay Sharks section
     """
     academy = models.ForeignKey(BombayShark, on_delete=models.CASCADE, related_name='gallery_images')
     image = models.ImageField(upload_to='bombay_sharks/gallery/')
+    # Displayed size and blurred placeholder, set on save - see portfolio.images
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     caption = models.CharField(max_length=300, blank=True)
     order = models.IntegerField(default=0)
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['order', '-created_at']
@@ -285,6 +364,9 @@ class Certification(models.Model):
     
     class Meta:
         ordering = ['-issue_date', 'order']
+        indexes = [
+            models.Index(fields=['-issue_date', 'order'], name='certification_order_idx'),
+        ]
         verbose_name = "Certification"
         verbose_name_plural = "Certifications"
     
@@ -324,10 +406,23 @@ class ContactSubmission(models.Model):
     # Admin fields
     submitted_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
+    is_archived = models.BooleanField(default=False, help_text="Hidden from the inbox")
     admin_notes = models.TextField(blank=True)
     
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['-submitted_at'], name='submission_recent_idx'),
+            models.Index(fields=['interest_type', '-submitted_at'], name='submission_interest_idx'),
+            models.Index(
+                fields=['-submitted_at'], condition=models.Q(is_read=False),
+                name='submission_unread_idx'
+            ),
+            models.Index(
+                fields=['-submitted_at'], condition=models.Q(is_archived=False),
+                name='submission_inbox_idx'
+            ),
+        ]
         verbose_name = "Contact Submission"
         verbose_name_plural = "Contact Submissions"
     
@@ -335,12 +430,16 @@ class ContactSubmission(models.Model):
         return f"{self.name} - {self.subject} ({self.submitted_at.strftime('%Y-%m-%d')})"
 
 
-class CompanyLogo(models.Model):
+class CompanyLogo(ImageMetadataMixin, models.Model):
     """
     Companies/brands worked with - for logo showcase
     """
     company_name = models.CharField(max_length=200)
     logo = models.ImageField(upload_to='company_logos/')
+    # Displayed size and blurred placeholder, set on save - see portfolio.images
+    logo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_placeholder = models.TextField(blank=True, editable=False)
     website_url = models.URLField(blank=True, validators=[URLValidator()])
     display_on_homepage = models.BooleanField(default=True)
     order = models.IntegerField(default=0, help_text="Display order")
@@ -350,8 +449,135 @@ class CompanyLogo(models.Model):
     
     class Meta:
         ordering = ['order', 'company_name']
+        indexes = [
+            models.Index(fields=['order', 'company_name'], name='companylogo_order_idx'),
+            models.Index(
+                fields=['order', 'company_name'], condition=models.Q(display_on_homepage=True),
+                name='companylogo_homepage_idx'
+            ),
+        ]
         verbose_name = "Company Logo"
         verbose_name_plural = "Company Logos"
     
     def __str__(self):
         return self.company_name
+
+
+# ============================================
+# BACKGROUND PROCESSING
+# ============================================
+
+class BackgroundTask(models.Model):
+    """
+    Work queued to run outside the request/response cycle.
+    Processed by the ``run_worker`` management command.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    task = models.CharField(max_length=100, help_text="Registered task name")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    
+    run_after = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='task_claim_idx'),
+        ]
+        verbose_name = "Background Task"
+        verbose_name_plural = "Background Tasks"
+    
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.get_status_display()})"
+
+
+class SubmissionArchive(models.Model):
+    """
+    A chunk of old contact submissions moved out of the live table, stored
+    as gzip-compressed JSON lines. See ``portfolio.archive``.
+    """
+    first_submitted_at = models.DateTimeField()
+    last_submitted_at = models.DateTimeField()
+    count = models.PositiveIntegerField()
+    data = models.BinaryField(help_text="gzip-compressed JSON lines, one submission per line")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-last_submitted_at']
+        indexes = [
+            models.Index(fields=['first_submitted_at', 'last_submitted_at'], name='archive_range_idx'),
+        ]
+        verbose_name = "Submission Archive"
+        verbose_name_plural = "Submission Archives"
+    
+    def __str__(self):
+        return (
+            f"{self.count} submissions, {self.first_submitted_at:%Y-%m-%d} "
+            f"to {self.last_submitted_at:%Y-%m-%d}"
+        )
+
+
+class SubmissionDailyCount(models.Model):
+    """
+    Number of contact submissions received on a day with a given interest
+    type and age group. Counted as submissions arrive, for the enrollment
+    dashboard - see ``portfolio.analytics``.
+    """
+    day = models.DateField()
+    interest_type = models.CharField(max_length=20, choices=ContactSubmission.ENROLLMENT_INTERESTS)
+    age_group = models.CharField(max_length=10, choices=ContactSubmission.AGE_GROUPS, blank=True)
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-day', 'interest_type', 'age_group']
+        constraints = [
+            # Also serves the dashboard's date range lookups
+            models.UniqueConstraint(
+                fields=['day', 'interest_type', 'age_group'], name='submission_rollup_key'
+            ),
+        ]
+        verbose_name = "Submission Daily Count"
+        verbose_name_plural = "Submission Daily Counts"
+    
+    def __str__(self):
+        return f"{self.day:%Y-%m-%d} {self.interest_type}/{self.age_group or '-'}: {self.count}"
+
+
+# ============================================
+# MEDIA STORAGE
+# ============================================
+
+class StoredFile(models.Model):
+    """
+    Reference count for a content-addressed upload.
+    Maintained by ``portfolio.storage.ContentAddressedStorage``.
+    """
+    name = models.CharField(max_length=255, unique=True, help_text="Storage name (content hash)")
+    size = models.PositiveBigIntegerField(default=0)
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Stored File"
+        verbose_name_plural = "Stored Files"
+    
+    def __str__(self):
+        return f"{self.name} ({self.references} refs)"
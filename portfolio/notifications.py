@@ -0,0 +1,103 @@
+"""
+Staff notifications for new contact submissions.
+
+Each submission fans out into one background task per delivery channel
+(staff email, every configured webhook, and the local file outbox), so a
+slow SMTP server or a failing webhook is retried on its own and never
+delays the visitor's request.
+"""
+import json
+import os
+import urllib.request
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .tasks import enqueue_many, task
+
+SUBMISSION_FIELDS = ['name', 'email', 'phone', 'subject', 'message', 'interest_type', 'age_group']
+
+
+def get_notify_emails():
+    """Staff addresses emailed about new submissions"""
+    return list(getattr(settings, 'PORTFOLIO_NOTIFY_EMAILS', []))
+
+
+def get_notify_webhooks():
+    """URLs that receive a JSON POST for every new submission"""
+    return list(getattr(settings, 'PORTFOLIO_NOTIFY_WEBHOOKS', []))
+
+
+def get_notification_outbox():
+    """Directory that collects notifications as JSON files, or None"""
+    return getattr(settings, 'PORTFOLIO_NOTIFICATION_OUTBOX', None)
+
+
+def submission_payload(submission):
+    """JSON-serializable snapshot of a ContactSubmission"""
+    payload = {field: getattr(submission, field) for field in SUBMISSION_FIELDS}
+    payload['id'] = submission.pk
+    payload['submitted_at'] = submission.submitted_at.isoformat() if submission.submitted_at else None
+    return payload
+
+
+def queue_notifications(submissions):
+    """Queue every notification for ``submissions`` in one INSERT"""
+    emails = get_notify_emails()
+    webhooks = get_notify_webhooks()
+    outbox = get_notification_outbox()
+
+    items = []
+    for submission in submissions:
+        payload = submission_payload(submission)
+        if emails:
+            items.append(('notify_email', {'submission': payload, 'recipients': emails}))
+        for url in webhooks:
+            items.append(('notify_webhook', {'submission': payload, 'url': url}))
+        if outbox:
+            items.append(('notify_outbox', {'submission': payload}))
+    return enqueue_many(items) if items else []
+
+
+def _summary(submission):
+    lines = [f"{field.replace('_', ' ').title()}: {submission.get(field) or '-'}"
+             for field in SUBMISSION_FIELDS if field != 'message']
+    return '\n'.join(lines + ['', submission.get('message', '')])
+
+
+@task('notify_email')
+def notify_email(payload, progress):
+    submission = payload['submission']
+    send_mail(
+        subject=f"New {submission['interest_type']} enquiry: {submission['subject']}",
+        message=_summary(submission),
+        from_email=None,
+        recipient_list=payload['recipients'],
+    )
+
+
+@task('notify_webhook')
+def notify_webhook(payload, progress):
+    request = urllib.request.Request(
+        payload['url'],
+        data=json.dumps({'event': 'contact_submission', 'submission': payload['submission']}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    # Non-2xx responses raise HTTPError, which the queue retries
+    with urllib.request.urlopen(request, timeout=10):
+        pass
+
+
+@task('notify_outbox')
+def notify_outbox(payload, progress):
+    outbox = get_notification_outbox()
+    if not outbox:
+        return
+    os.makedirs(outbox, exist_ok=True)
+    submission = payload['submission']
+    filename = os.path.join(outbox, f"submission-{submission['id'] or 'unsaved'}.json")
+    # Write then rename so readers never see a half-written file
+    with open(f'{filename}.tmp', 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(f'{filename}.tmp', filename)
@@ -0,0 +1,136 @@
+"""
+Read-only snapshot routing for public pages.
+
+With ``PORTFOLIO_READ_REPLICA`` set, anonymous visitors to the public views
+read from a snapshot of the main database (the ``replica`` alias) while the
+admin, contact submissions and the worker keep using ``default``. Admin
+bulk edits and contact floods then never hold locks that public pages wait
+on.
+
+The snapshot is a plain SQLite copy taken with the online backup API and
+swapped in atomically. Content edits queue a ``refresh_replica`` task,
+which rebuilds it and then invalidates the page cache so pages re-render
+from the new snapshot; ``manage.py refresh_replica`` does the same on a
+schedule.
+"""
+import os
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from .cache import bump_content_version
+from .tasks import enqueue, task
+
+REPLICA_ALIAS = 'replica'
+
+_public_reads = ContextVar('portfolio_public_reads', default=False)
+
+
+def get_replica_path():
+    """Filesystem path of the snapshot, or None when routing is disabled"""
+    path = getattr(settings, 'PORTFOLIO_READ_REPLICA', None)
+    if not path or REPLICA_ALIAS not in settings.DATABASES:
+        return None
+    return os.fspath(path)
+
+
+def replica_available():
+    path = get_replica_path()
+    return path is not None and os.path.exists(path)
+
+
+@contextmanager
+def public_reads():
+    """Route ORM reads inside the block to the snapshot, if there is one"""
+    token = _public_reads.set(True)
+    try:
+        yield
+    finally:
+        _public_reads.reset(token)
+
+
+class PublicReadRouter:
+    """
+    Send reads made inside ``public_reads()`` to the snapshot. Everything
+    else, and every write, uses the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _public_reads.get() and replica_available():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+class PublicReadMixin:
+    """
+    View mixin that renders anonymous requests from the snapshot. Staff keep
+    reading the primary so they see their edits immediately.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        with public_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            # Templates evaluate lazy querysets - render while still routed
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
+
+
+def refresh_replica():
+    """
+    Rebuild the snapshot from the primary database. Returns False when
+    routing is disabled.
+    """
+    path = get_replica_path()
+    if path is None:
+        return False
+
+    source = connections['default']
+    source.ensure_connection()
+    temp_path = f'{path}.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    target = sqlite3.connect(temp_path)
+    try:
+        # Online backup: writers on the primary are not blocked under WAL
+        source.connection.backup(target)
+        # The snapshot is opened read-only, which WAL files would prevent
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target.close()
+
+    # Atomic swap: open connections keep the old file until they close
+    os.replace(temp_path, path)
+    connections[REPLICA_ALIAS].close()
+    return True
+
+
+def queue_replica_refresh():
+    """Queue a snapshot rebuild unless one is already pending"""
+    if get_replica_path() is not None:
+        enqueue('refresh_replica', unique=True)
+
+
+@task('refresh_replica')
+def refresh_replica_task(payload, progress):
+    if refresh_replica():
+        # Pages cached before the refresh rendered from the old snapshot
+        bump_content_version()
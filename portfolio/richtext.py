@@ -0,0 +1,219 @@
+"""
+Save-time rendering of CKEditor rich text.
+
+Rich text is sanitized and normalized once, when a model is saved, into a
+companion ``*_html`` column (plus any truncated summaries), so templates
+output stored, already-safe HTML with no per-request processing.
+
+The sanitizer is an allowlist built on the standard library HTML parser:
+unknown tags are unwrapped, script-like elements are dropped with their
+content, attributes are limited per tag, URLs must use a safe scheme and
+inline styles are reduced to a few presentational properties. Its output
+is always well-formed (every open tag is closed).
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+
+from django.db import models
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'figcaption', 'figure',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre',
+    's', 'span', 'strike', 'strong', 'sub', 'sup', 'table', 'tbody', 'td',
+    'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+
+VOID_TAGS = {'br', 'hr', 'img'}
+
+# Dropped together with everything inside them
+DROPPED_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'svg', 'math'}
+
+# Presentational tags normalized to their semantic equivalents
+RENAMED_TAGS = {'b': 'strong', 'i': 'em', 'strike': 's'}
+
+ALLOWED_ATTRIBUTES = {
+    '*': {'class', 'style', 'title'},
+    'a': {'href', 'target', 'rel'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start', 'type'},
+}
+
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'http', 'https', 'mailto', 'tel'}
+
+ALLOWED_STYLES = {
+    'text-align', 'color', 'background-color', 'font-weight', 'font-style',
+    'text-decoration', 'margin-left', 'padding-left', 'width', 'height',
+}
+UNSAFE_STYLE_RE = re.compile(r'url\s*\(|expression\s*\(|[\\<>]|javascript:', re.IGNORECASE)
+
+SCHEME_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+# Characters browsers ignore inside a URL scheme ("java\nscript:")
+URL_IGNORED_RE = re.compile(r'[\x00-\x20]+')
+EMPTY_PARAGRAPH_RE = re.compile(r'<p>(?:\s|\xa0|<br>)*</p>')
+BLANK_BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+
+
+def _safe_url(value):
+    url = URL_IGNORED_RE.sub('', value)
+    match = SCHEME_RE.match(url)
+    if match and match.group(1).lower() not in ALLOWED_SCHEMES:
+        return None
+    return value.strip()
+
+
+def _safe_style(value):
+    declarations = []
+    for declaration in value.split(';'):
+        name, _, style_value = declaration.partition(':')
+        name, style_value = name.strip().lower(), style_value.strip()
+        if name in ALLOWED_STYLES and style_value and not UNSAFE_STYLE_RE.search(style_value):
+            declarations.append(f'{name}: {style_value}')
+    return '; '.join(declarations) or None
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            if tag not in VOID_TAGS:
+                self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        tag = RENAMED_TAGS.get(tag, tag)
+
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        cleaned = {}
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _safe_url(value)
+            elif name == 'style':
+                value = _safe_style(value)
+            if value is not None:
+                cleaned[name] = value
+        if tag == 'a' and cleaned.get('target') == '_blank':
+            cleaned['rel'] = 'noopener noreferrer'
+
+        rendered = ''.join(f' {name}="{escape(value)}"' for name, value in cleaned.items())
+        self.output.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            # Self-closed (<svg/>): nothing to drop, and no end tag will
+            # come to stop dropping what follows
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and not self.dropping:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        tag = RENAMED_TAGS.get(tag, tag)
+        if self.dropping or tag not in self.open_tags:
+            return
+        # Close anything left open inside this element
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.output.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.output.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.output.append(f'</{self.open_tags.pop()}>')
+        return ''.join(self.output)
+
+
+def sanitize_html(value):
+    """Allowlist-sanitized, normalized HTML for untrusted rich text"""
+    if not value:
+        return ''
+    parser = _Sanitizer()
+    parser.feed(value)
+    html = parser.close()
+    html = BLANK_BETWEEN_TAGS_RE.sub('><', html)
+    html = EMPTY_PARAGRAPH_RE.sub('', html)
+    return html.strip()
+
+
+def truncate_html(value, words):
+    """Sanitized HTML cut to ``words`` words, closing any open tags"""
+    return Truncator(value).words(words, html=True, truncate=' …')
+
+
+class SanitizedHTMLField(models.TextField):
+    """
+    Stores HTML produced by ``sanitize_html``. Values load as safe strings,
+    so templates output them without ``|safe``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def from_db_value(self, value, expression, connection):
+        return mark_safe(value) if value is not None else value
+
+
+class RenderedRichTextMixin:
+    """
+    Model mixin that renders rich text fields into ``SanitizedHTMLField``
+    columns on save. Declare on the model:
+
+        rendered_rich_text = {'bio': 'bio_html'}
+        truncated_rich_text = {'summary_html': ('bio', 30)}
+    """
+
+    rendered_rich_text = {}
+    truncated_rich_text = {}
+
+    def render_rich_text(self):
+        """Refresh every rendered column from its source field"""
+        for source, target in self.rendered_rich_text.items():
+            setattr(self, target, mark_safe(sanitize_html(getattr(self, source))))
+        for target, (source, words) in self.truncated_rich_text.items():
+            clean = sanitize_html(getattr(self, source))
+            setattr(self, target, mark_safe(truncate_html(clean, words)))
+
+    @classmethod
+    def rendered_fields(cls, sources=None):
+        """Rendered column names, optionally only those derived from ``sources``"""
+        names = [
+            target for source, target in cls.rendered_rich_text.items()
+            if sources is None or source in sources
+        ]
+        names += [
+            target for target, (source, _) in cls.truncated_rich_text.items()
+            if sources is None or source in sources
+        ]
+        return names
+
+    def save(self, *args, **kwargs):
+        self.render_rich_text()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(self.rendered_fields(update_fields))
+        return super().save(*args, **kwargs)
@@ -0,0 +1,102 @@
+"""
+Full-text search over contact submissions.
+
+An SQLite FTS5 index (``portfolio_contactsubmission_fts``, created by
+migration 0010) mirrors the name, email, subject and message of every
+submission. Triggers on the submissions table keep it in step with inserts,
+edits and deletes, including bulk operations that skip model signals, so
+a search is an index lookup instead of a ``LIKE '%...%'`` scan over every
+message.
+
+On SQLite most field changes make Django rebuild the submissions table,
+which drops its triggers; ``ensure_search_index`` (run after every
+``migrate``) puts them back and reindexes.
+"""
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SUBMISSION_FTS_TABLE = 'portfolio_contactsubmission_fts'
+
+# Used where FTS5 isn't available (other database backends)
+SUBMISSION_SEARCH_FIELDS = ('name', 'email', 'subject', 'message')
+
+_COLUMNS = 'name, email, subject, message'
+_DELETE_OLD = (
+    f"INSERT INTO {SUBMISSION_FTS_TABLE}({SUBMISSION_FTS_TABLE}, rowid, {_COLUMNS}) "
+    f"VALUES ('delete', old.id, old.name, old.email, old.subject, old.message);"
+)
+_INSERT_NEW = (
+    f"INSERT INTO {SUBMISSION_FTS_TABLE}(rowid, {_COLUMNS}) "
+    f"VALUES (new.id, new.name, new.email, new.subject, new.message);"
+)
+
+# Triggers keeping the index in sync, as created by migration 0010
+SUBMISSION_FTS_TRIGGERS = {
+    f'{SUBMISSION_FTS_TABLE}_insert':
+        f'AFTER INSERT ON portfolio_contactsubmission BEGIN {_INSERT_NEW} END',
+    f'{SUBMISSION_FTS_TABLE}_delete':
+        f'AFTER DELETE ON portfolio_contactsubmission BEGIN {_DELETE_OLD} END',
+    f'{SUBMISSION_FTS_TABLE}_update':
+        f'AFTER UPDATE OF {_COLUMNS} ON portfolio_contactsubmission '
+        f'BEGIN {_DELETE_OLD} {_INSERT_NEW} END',
+}
+
+
+def ensure_search_index(connection):
+    """
+    Recreate missing sync triggers and rebuild the index if any were
+    missing. Returns whether anything had to be repaired.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [SUBMISSION_FTS_TABLE],
+        )
+        if cursor.fetchone() is None:
+            # Not migrated yet
+            return False
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in SUBMISSION_FTS_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(f'CREATE TRIGGER {name} {SUBMISSION_FTS_TRIGGERS[name]}')
+        if missing:
+            # Rows written while the triggers were gone are not indexed
+            cursor.execute(
+                f"INSERT INTO {SUBMISSION_FTS_TABLE}({SUBMISSION_FTS_TABLE}) VALUES ('rebuild')"
+            )
+    return bool(missing)
+
+
+def search_words(term):
+    """Words of a search box entry, ignoring ones without letters or digits"""
+    return [word for word in term.split() if any(char.isalnum() for char in word)]
+
+
+def fts_query(term):
+    """
+    FTS5 MATCH expression for rows containing every word of ``term``, each
+    as a prefix. Words are quoted, so user input can't inject FTS syntax.
+    """
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in search_words(term))
+
+
+def search_submissions(queryset, term):
+    """Filter a ContactSubmission queryset to rows matching ``term``"""
+    words = search_words(term)
+    if not words:
+        return queryset
+    if connections[queryset.db].vendor != 'sqlite':
+        for word in words:
+            match = Q()
+            for field in SUBMISSION_SEARCH_FIELDS:
+                match |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(match)
+        return queryset
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {SUBMISSION_FTS_TABLE} WHERE {SUBMISSION_FTS_TABLE} MATCH %s',
+        (fts_query(term),),
+    ))
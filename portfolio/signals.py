@@ -0,0 +1,112 @@
+"""
+Signal handlers that keep cached pages and image derivatives in sync
+with admin edits, and count new contact submissions
+"""
+from django.db import connections, models, transaction
+from django.db.models.signals import pre_save, post_save, post_delete, post_migrate
+from django.dispatch import receiver
+
+from .analytics import record_submissions
+from .cache import HOMEPAGE_SECTIONS, bump_content_version
+from .images import ensure_derivatives, image_fields
+from .models import (
+    Project, ProjectImage, Testimonial, GalleryImage, ActionPhoto, ContactSubmission,
+)
+from .replica import queue_replica_refresh
+from .search import ensure_search_index
+from .tasks import enqueue_derivatives
+
+# Models rendered on the homepage - any change to these invalidates it
+HOMEPAGE_MODELS = frozenset(
+    model for section_models in HOMEPAGE_SECTIONS.values() for model in section_models
+)
+
+# Models read by the public views - edits make the read snapshot stale
+PUBLIC_MODELS = HOMEPAGE_MODELS | {Project, ProjectImage, Testimonial}
+
+# Gallery-style models whose (often large, bulk-uploaded) images are
+# processed by the background worker instead of during the admin request
+BACKGROUND_IMAGE_MODELS = (ProjectImage, GalleryImage, ActionPhoto)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_page_cache(sender, **kwargs):
+    """Bump the content version when homepage content changes"""
+    if sender in HOMEPAGE_MODELS:
+        bump_content_version()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def refresh_read_replica(sender, **kwargs):
+    """Rebuild the public read snapshot after content edits"""
+    if sender in PUBLIC_MODELS:
+        queue_replica_refresh()
+
+
+@receiver(post_save)
+def generate_responsive_images(sender, instance, raw=False, **kwargs):
+    """Create srcset derivatives for newly uploaded images"""
+    if raw or sender._meta.app_label != 'portfolio':
+        return
+    for field in image_fields(sender):
+        if sender in BACKGROUND_IMAGE_MODELS:
+            enqueue_derivatives(instance, field.name)
+        else:
+            ensure_derivatives(getattr(instance, field.name))
+
+
+def _releasable_fields(model):
+    # File fields backed by reference-counted (content-addressed) storage
+    return [
+        field for field in model._meta.fields
+        if isinstance(field, models.FileField) and hasattr(field.storage, 'release')
+    ]
+
+
+def _release_on_commit(storage, name):
+    transaction.on_commit(lambda: storage.release(name))
+
+
+@receiver(pre_save)
+def release_replaced_files(sender, instance, raw=False, **kwargs):
+    """Drop the reference to a stored file when a field is given a new one"""
+    if raw or instance.pk is None or sender._meta.app_label != 'portfolio':
+        return
+    fields = _releasable_fields(sender)
+    if not fields:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values(*[f.attname for f in fields]).first()
+    if not previous:
+        return
+    for field in fields:
+        old_name = previous[field.attname]
+        if old_name and old_name != getattr(instance, field.attname).name:
+            _release_on_commit(field.storage, old_name)
+
+
+@receiver(post_delete)
+def release_deleted_files(sender, instance, **kwargs):
+    """Drop references held by a deleted row"""
+    if sender._meta.app_label != 'portfolio':
+        return
+    for field in _releasable_fields(sender):
+        fieldfile = getattr(instance, field.attname)
+        if fieldfile:
+            _release_on_commit(field.storage, fieldfile.name)
+
+
+@receiver(post_save, sender=ContactSubmission)
+def count_submission(sender, instance, created, raw=False, **kwargs):
+    """Add a new submission to the daily rollups"""
+    # Raw saves are archive restores and fixtures, counted when they arrived
+    if created and not raw:
+        record_submissions([instance])
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, using, **kwargs):
+    """Restore submission search triggers dropped by table rebuilds"""
+    if sender.name == 'portfolio':
+        ensure_search_index(connections[using])
@@ -0,0 +1,136 @@
+"""
+Static asset bundling, fingerprinting and pre-compression.
+
+``BundledManifestStorage`` extends Django's ``ManifestStaticFilesStorage``.
+During ``collectstatic`` it:
+
+1. concatenates and minifies the source files of each bundle in
+   ``PORTFOLIO_STATIC_BUNDLES`` (``css/site.css``, ``js/site.js``),
+2. gives every file a content-hashed name recorded in ``staticfiles.json``,
+   so browsers can cache them for a year,
+3. writes ``.gz`` and, if the optional ``brotli`` package is installed,
+   ``.br`` copies of text assets for servers that serve pre-compressed files.
+
+Templates use ``{% static_bundle %}`` (``portfolio_assets``), which links the
+single bundle in production and the individual source files under DEBUG.
+"""
+import gzip
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+DEFAULT_BUNDLES = {
+    'css/site.css': [
+        'css/main.css',
+        'css/components.css',
+        'css/animations.css',
+        'css/smooth-animations.css',
+        'css/responsive.css',
+    ],
+    'js/site.js': [
+        'js/main.js',
+    ],
+}
+
+# Text assets worth pre-compressing; smaller files gain nothing
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.html', '.map')
+MIN_COMPRESS_SIZE = 256
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_SPACE_RE = re.compile(r'\s+')
+# Spaces before ':' are kept - "a :hover" and "a:hover" differ
+CSS_PUNCTUATION_RE = re.compile(r'\s*([{};,>])\s*')
+CSS_COLON_RE = re.compile(r':\s+')
+JS_LINE_COMMENT_RE = re.compile(r'^\s*//.*$', re.MULTILINE)
+
+
+def get_bundles():
+    return getattr(settings, 'PORTFOLIO_STATIC_BUNDLES', DEFAULT_BUNDLES)
+
+
+def minify_css(source):
+    """Strip comments and insignificant whitespace from CSS"""
+    source = CSS_COMMENT_RE.sub('', source)
+    source = CSS_SPACE_RE.sub(' ', source)
+    source = CSS_PUNCTUATION_RE.sub(r'\1', source)
+    source = CSS_COLON_RE.sub(':', source)
+    return source.replace(';}', '}').strip()
+
+
+def minify_js(source):
+    """
+    Conservative JavaScript minification: drop whole-line comments,
+    indentation and blank lines. Line breaks are kept so automatic
+    semicolon insertion behaves exactly as in the source.
+    """
+    source = JS_LINE_COMMENT_RE.sub('', source)
+    return '\n'.join(line.strip() for line in source.splitlines() if line.strip())
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+
+def build_bundle(name, sources):
+    """Concatenated, minified content of ``sources`` (static paths)"""
+    minify = MINIFIERS.get(name[name.rfind('.'):], lambda source: source)
+    parts = []
+    for source in sources:
+        path = finders.find(source)
+        if path is None:
+            raise ValueError(f"Bundle {name!r}: static file {source!r} not found")
+        with open(path, encoding='utf-8') as f:
+            parts.append(minify(f.read()))
+    # ';' guards against a JS file ending without a semicolon
+    separator = '\n;\n' if name.endswith('.js') else '\n'
+    return separator.join(parts)
+
+
+class BundledManifestStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also builds bundles and compressed copies"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+
+        for name, sources in get_bundles().items():
+            if self.exists(name):
+                self.delete(name)
+            self._save(name, ContentFile(build_bundle(name, sources).encode('utf-8')))
+            # Hashed and url()-rewritten like any collected file
+            paths[name] = (self, name)
+
+        yield from super().post_process(paths, dry_run, **options)
+
+        for name in set(self.hashed_files.values()):
+            self.compress(name)
+
+    def compress(self, name):
+        """Write pre-compressed variants of ``name`` next to it"""
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+
+        variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(content)
+        for suffix, compressed in variants.items():
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
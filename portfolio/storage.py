@@ -0,0 +1,116 @@
+"""
+Content-addressed media storage.
+
+Uploads are stored under the SHA-256 of their content
+(``content/ab/cd/abcd....jpg``) regardless of the field's ``upload_to``, so
+the same photo used as a profile picture, project hero and gallery image
+occupies disk once. A ``StoredFile`` row counts the references to each
+blob; when the last one goes away the file and its derivatives are removed.
+
+Because a hashed name can never point at different bytes, these URLs can be
+served with far-future ``immutable`` cache headers.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.db.models import F
+
+CONTENT_PREFIX = 'content'
+
+HASHED_NAME_RE = re.compile(
+    rf'^{CONTENT_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.[^/]*)?$'
+)
+
+# Suffixes of files generated from an original (see ``portfolio.images``):
+# responsive derivatives, their manifest and admin thumbnails
+DERIVED_SUFFIX_RE = re.compile(r'\.(?:(?:w|thumb)\d+\.[a-z0-9]+|responsive\.json)$')
+
+# Extensions naming the same format, so identical bytes share one blob
+EXTENSION_ALIASES = {
+    '.jpeg': '.jpg',
+    '.jpe': '.jpg',
+    '.tif': '.tiff',
+}
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that deduplicates uploads by content hash"""
+
+    def is_addressed(self, name):
+        """Whether ``name`` lives in the content-addressed namespace"""
+        return bool(HASHED_NAME_RE.match(name.replace('\\', '/')))
+
+    def is_derived(self, name):
+        """Whether ``name`` is a file generated from another stored image"""
+        return bool(DERIVED_SUFFIX_RE.search(name))
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        ext = os.path.splitext(name)[1].lower()
+        ext = EXTENSION_ALIASES.get(ext, ext)
+        return f'{CONTENT_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if self.is_addressed(name) or self.is_derived(name):
+            # Files derived from an original (``<hash>.w480.webp``,
+            # manifests, thumbnails) are already uniquely named and live
+            # and die with it - store them verbatim, even beside originals
+            # uploaded before content addressing
+            return super().save(name, content, max_length)
+
+        hashed = self.hashed_name(name, content)
+        if not self.exists(hashed):
+            hashed = super().save(hashed, content, max_length)
+        self.retain(hashed, content.size)
+        return hashed
+
+    def retain(self, name, size=0):
+        """Record one more reference to ``name``"""
+        # Imported lazily: storages are built before the app registry is ready
+        from .models import StoredFile
+        stored, created = StoredFile.objects.get_or_create(
+            name=name, defaults={'size': size, 'references': 1}
+        )
+        if not created:
+            StoredFile.objects.filter(pk=stored.pk).update(references=F('references') + 1)
+
+    def release(self, name):
+        """Drop one reference to ``name``, deleting the blob when unused"""
+        from .models import StoredFile
+        if not name or not self.is_addressed(name):
+            return
+        StoredFile.objects.filter(name=name, references__gt=0).update(
+            references=F('references') - 1
+        )
+        deleted, _ = StoredFile.objects.filter(name=name, references=0).delete()
+        if deleted:
+            self.delete_with_derivatives(name)
+
+    def delete_with_derivatives(self, name):
+        """Delete a blob together with every file derived from it"""
+        directory, filename = os.path.split(name)
+        stem = os.path.splitext(filename)[0]
+        if not self.exists(directory):
+            return
+        siblings = [
+            sibling for sibling in self.listdir(directory)[1]
+            if sibling != filename and sibling.startswith(f'{stem}.')
+        ]
+        self.delete(name)
+        # Imported lazily, like the models: images imports the model layer
+        from .images import forget_derivatives
+        forget_derivatives(name, siblings)
+        # Blobs stored before extensions were normalised (``<hash>.jpeg``
+        # beside ``<hash>.jpg``) share their derivatives; keep them while
+        # any such original is still around
+        if any(not self.is_derived(sibling) for sibling in siblings):
+            return
+        for sibling in siblings:
+            self.delete(f'{directory}/{sibling}')
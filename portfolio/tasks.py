@@ -0,0 +1,160 @@
+"""
+Lightweight database-backed task queue.
+
+Tasks are plain functions registered by name with ``@task``; ``enqueue``
+stores a ``BackgroundTask`` row and the ``run_worker`` management command
+claims and runs pending rows, retrying failures with exponential backoff.
+No external broker is needed - the queue lives in the main database.
+"""
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import bump_content_version
+from .images import generate_derivatives, manifest_name
+from .models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+# Base delay before retrying a failed task; doubled on every attempt
+RETRY_DELAY = timedelta(seconds=30)
+
+# Running tasks not finished within this window are assumed abandoned
+STALE_AFTER = timedelta(minutes=30)
+
+REGISTRY = {}
+
+
+def task(name):
+    """Register ``func(payload, progress)`` as a queueable task"""
+    def decorator(func):
+        REGISTRY[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, max_attempts=3, unique=False):
+    """
+    Queue task ``name``. With ``unique=True`` an identical task that is
+    still pending is reused instead of queueing a duplicate.
+    """
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown task: {name}")
+    payload = payload or {}
+    if unique:
+        existing = BackgroundTask.objects.filter(
+            task=name, payload=payload, status=BackgroundTask.STATUS_PENDING
+        ).first()
+        if existing:
+            return existing
+    return BackgroundTask.objects.create(task=name, payload=payload, max_attempts=max_attempts)
+
+
+def enqueue_many(items, max_attempts=3):
+    """Queue several ``(name, payload)`` tasks with a single INSERT"""
+    for name, _ in items:
+        if name not in REGISTRY:
+            raise ValueError(f"Unknown task: {name}")
+    return BackgroundTask.objects.bulk_create([
+        BackgroundTask(task=name, payload=payload or {}, max_attempts=max_attempts)
+        for name, payload in items
+    ])
+
+
+def requeue_stale_tasks():
+    """Return tasks left running by a crashed worker to the queue"""
+    return BackgroundTask.objects.filter(
+        status=BackgroundTask.STATUS_RUNNING,
+        started_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=BackgroundTask.STATUS_PENDING)
+
+
+def claim_next_task():
+    """Atomically claim the next runnable task, or return None"""
+    now = timezone.now()
+    candidates = BackgroundTask.objects.filter(
+        status=BackgroundTask.STATUS_PENDING, run_after__lte=now
+    ).order_by('run_after', 'pk').values_list('pk', flat=True)[:10]
+
+    for pk in candidates:
+        # Conditional UPDATE: only one worker can move a row out of pending
+        claimed = BackgroundTask.objects.filter(
+            pk=pk, status=BackgroundTask.STATUS_PENDING
+        ).update(
+            status=BackgroundTask.STATUS_RUNNING,
+            attempts=F('attempts') + 1,
+            progress=0,
+            started_at=now,
+        )
+        if claimed:
+            return BackgroundTask.objects.get(pk=pk)
+    return None
+
+
+def run_task(background_task):
+    """Run a claimed task and record its outcome"""
+    queryset = BackgroundTask.objects.filter(pk=background_task.pk)
+
+    def progress(percent):
+        queryset.update(progress=max(0, min(100, int(percent))))
+
+    try:
+        func = REGISTRY[background_task.task]
+        func(background_task.payload, progress)
+    except Exception as exc:
+        logger.exception('Task %s failed', background_task)
+        if background_task.attempts >= background_task.max_attempts:
+            status, run_after = BackgroundTask.STATUS_FAILED, background_task.run_after
+        else:
+            delay = RETRY_DELAY * (2 ** (background_task.attempts - 1))
+            status, run_after = BackgroundTask.STATUS_PENDING, timezone.now() + delay
+        queryset.update(
+            status=status, run_after=run_after, last_error=f'{type(exc).__name__}: {exc}'
+        )
+        return False
+
+    queryset.update(
+        status=BackgroundTask.STATUS_DONE,
+        progress=100,
+        last_error='',
+        finished_at=timezone.now(),
+    )
+    return True
+
+
+# ============================================
+# TASKS
+# ============================================
+
+def enqueue_derivatives(instance, field_name):
+    """Queue responsive image generation for one ImageField of ``instance``"""
+    fieldfile = getattr(instance, field_name)
+    if not fieldfile or fieldfile.storage.exists(manifest_name(fieldfile.name)):
+        return None
+    return enqueue('generate_derivatives', {
+        'model': instance._meta.label_lower,
+        'pk': instance.pk,
+        'field': field_name,
+    }, unique=True)
+
+
+@task('generate_derivatives')
+def generate_derivatives_task(payload, progress):
+    model = apps.get_model(payload['model'])
+    instance = model.objects.filter(pk=payload['pk']).first()
+    if instance is None:
+        # Deleted while queued - nothing to do
+        return
+    fieldfile = getattr(instance, payload['field'])
+    if not fieldfile:
+        return
+
+    generate_derivatives(fieldfile, progress=progress)
+
+    # Rendered fragments embed the srcset, so refresh them now that it exists
+    if any(field.name == 'updated_at' for field in model._meta.fields):
+        model.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+    bump_content_version()
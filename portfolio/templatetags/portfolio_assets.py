@@ -0,0 +1,55 @@
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from portfolio.critical_css import get_critical_css
+from portfolio.staticfiles import get_bundles
+
+register = template.Library()
+
+TAGS = {
+    '.css': '<link rel="stylesheet" href="{}">',
+    '.js': '<script src="{}"></script>',
+}
+
+# Stylesheet fetched without blocking render, applied once loaded
+DEFERRED_CSS_TAG = (
+    '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+    '<noscript><link rel="stylesheet" href="{0}"></noscript>'
+)
+
+
+@register.simple_tag
+def static_bundle(name, defer=False):
+    """
+    Link a static bundle built by ``collectstatic``:
+
+        {% static_bundle 'css/site.css' defer=True %}
+
+    Under DEBUG, or before the bundle has been collected, the individual
+    source files are linked instead so edits show up without rebuilding.
+    ``defer`` loads stylesheets without blocking render, and only takes
+    effect once the critical CSS has been built.
+    """
+    collected = getattr(staticfiles_storage, 'hashed_files', {})
+    if not settings.DEBUG and name in collected:
+        urls = [static(name)]
+    else:
+        urls = [static(source) for source in get_bundles()[name]]
+    tag = TAGS[name[name.rfind('.'):]]
+    if defer and name.endswith('.css') and get_critical_css():
+        tag = DEFERRED_CSS_TAG
+    return format_html_join('\n    ', tag, ((url,) for url in urls))
+
+
+@register.simple_tag
+def critical_css():
+    """Inline the above-the-fold styles from ``build_critical_css``"""
+    css = get_critical_css()
+    if not css:
+        return ''
+    # Generated from our own stylesheets; only guard against closing the tag
+    return format_html('<style>{}</style>', mark_safe(css.strip().replace('</', '<\\/')))
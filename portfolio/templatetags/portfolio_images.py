@@ -0,0 +1,74 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from portfolio.images import MIME_TYPES, get_manifest, metadata_field_names
+
+register = template.Library()
+
+
+def _srcset(storage, entries):
+    return ', '.join(f'{storage.url(name)} {width}w' for width, name in entries)
+
+
+def _stored_metadata(image):
+    """(width, height, placeholder) saved on the image's model instance"""
+    instance = getattr(image, 'instance', None)
+    if instance is None:
+        return None, None, ''
+    names = metadata_field_names(type(instance), image.field.name)
+    if names is None or any(name not in instance.__dict__ for name in names):
+        return None, None, ''
+    return tuple(instance.__dict__[name] for name in names)
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', **attrs):
+    """
+    Render an uploaded image as a <picture> with AVIF/WebP sources and a
+    fallback srcset. Extra keyword arguments become <img> attributes:
+
+        {% responsive_image cert.certificate_image alt=cert.name class="cert-badge" sizes="80px" loading="lazy" %}
+
+    Known dimensions are emitted as width/height so the browser reserves
+    the space, and a stored placeholder is painted as the background until
+    the image loads.
+    """
+    if not image:
+        return ''
+
+    manifest = get_manifest(image)
+    width, height, placeholder = _stored_metadata(image)
+    if width is None and manifest:
+        width, height = manifest['width'], manifest['height']
+    if width and height:
+        attrs.setdefault('width', width)
+        attrs.setdefault('height', height)
+    if placeholder:
+        background = f'background: url({placeholder}) center / cover no-repeat'
+        attrs['style'] = f"{background}; {attrs['style']}" if attrs.get('style') else background
+    if attrs.get('loading') == 'lazy':
+        attrs.setdefault('decoding', 'async')
+
+    extra = format_html_join('', ' {}="{}"', attrs.items())
+    if not manifest:
+        return format_html('<img src="{}" alt="{}"{}>', image.url, alt, extra)
+
+    storage = image.storage
+    fallback = manifest['fallback']
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[fmt], _srcset(storage, entries), sizes)
+            for fmt, entries in manifest['sources'].items() if fmt != fallback
+        ),
+    )
+    fallback_entries = manifest['sources'][fallback]
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}"{}></picture>',
+        sources,
+        storage.url(fallback_entries[-1][1]),
+        _srcset(storage, fallback_entries),
+        sizes,
+        alt,
+        extra,
+    )
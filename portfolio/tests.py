@@ -1,3 +1,370 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .admin import ContactSubmissionAdmin
+from .analytics import rebuild_rollups
+from .archive import archivable, archive_submissions, restore_archive
+from .middleware import StaticMediaMiddleware
+from .models import (
+    BackgroundTask, ContactSubmission, StoredFile, SubmissionArchive, SubmissionDailyCount,
+)
+from .richtext import sanitize_html
+from .search import SUBMISSION_FTS_TRIGGERS, ensure_search_index, search_submissions
+from .storage import ContentAddressedStorage
+from .tasks import REGISTRY, claim_next_task, enqueue, run_task
+from .throttling import TokenBucketLimiter
+
+
+def create_submission(**kwargs):
+    values = {
+        'name': 'Parent', 'email': 'parent@example.com', 'phone': '+91 98200 00000',
+        'subject': 'Enrollment', 'message': 'Hello', 'interest_type': 'academy',
+        'age_group': 'U10',
+    }
+    values.update(kwargs)
+    return ContactSubmission.objects.create(**values)
+
+
+class SanitizeHtmlTests(TestCase):
+    def test_keeps_allowed_markup(self):
+        self.assertEqual(
+            sanitize_html('<p><b>Bold</b> and <a href="https://example.com">link</a></p>'),
+            '<p><strong>Bold</strong> and <a href="https://example.com">link</a></p>',
+        )
+
+    def test_drops_scripts_with_their_content(self):
+        self.assertEqual(sanitize_html('<p>a<script>alert(1)</script>b</p>'), '<p>ab</p>')
+
+    def test_strips_event_handlers(self):
+        self.assertEqual(
+            sanitize_html('<img src="x.png" onerror="alert(1)">'), '<img src="x.png">'
+        )
+
+    def test_removes_javascript_urls(self):
+        for href in ('javascript:alert(1)', 'JaVaScRiPt:alert(1)', 'java\nscript:alert(1)'):
+            with self.subTest(href=href):
+                self.assertEqual(sanitize_html(f'<a href="{href}">x</a>'), '<a>x</a>')
+
+    def test_filters_unsafe_styles(self):
+        self.assertEqual(
+            sanitize_html('<p style="color: red; background-image: url(x); width: expression(1)">x</p>'),
+            '<p style="color: red">x</p>',
+        )
+
+    def test_self_closing_dropped_tags_keep_following_content(self):
+        self.assertEqual(
+            sanitize_html('<p>a<svg/>b<script/>c</p><p>d</p>'), '<p>abc</p><p>d</p>'
+        )
+
+    def test_escapes_text_and_closes_open_tags(self):
+        self.assertEqual(sanitize_html('<p><em>1 < 2 & 3'), '<p><em>1 &lt; 2 &amp; 3</em></p>')
+
+    def test_blank_target_gets_noopener(self):
+        self.assertEqual(
+            sanitize_html('<a href="/x" target="_blank">x</a>'),
+            '<a href="/x" target="_blank" rel="noopener noreferrer">x</a>',
+        )
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def references(self, name):
+        return StoredFile.objects.get(name=name).references
+
+    def test_same_content_is_stored_once(self):
+        first = self.storage.save('a/photo.jpg', ContentFile(b'photo'))
+        second = self.storage.save('b/copy.JPEG', ContentFile(b'photo'))
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith('content/'))
+        self.assertEqual(self.references(first), 2)
+
+    def test_release_deletes_blob_and_derivatives_with_last_reference(self):
+        name = self.storage.save('photo.jpg', ContentFile(b'photo'))
+        self.storage.save('photo.jpg', ContentFile(b'photo'))
+        derivative = self.storage.save(name.replace('.jpg', '.w480.webp'), ContentFile(b'small'))
+        self.assertEqual(derivative, name.replace('.jpg', '.w480.webp'))
+
+        self.storage.release(name)
+        self.assertEqual(self.references(name), 1)
+        self.assertTrue(self.storage.exists(name))
+
+        self.storage.release(name)
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(self.storage.exists(derivative))
+
+    def test_derivatives_of_legacy_files_keep_their_names(self):
+        name = self.storage.save('profile/photo.responsive.json', ContentFile(b'{}'))
+        self.assertEqual(name, 'profile/photo.responsive.json')
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_release_ignores_legacy_names(self):
+        name = self.storage.save('profile/photo.w480.webp', ContentFile(b'small'))
+        self.storage.release(name)
+        self.assertTrue(self.storage.exists(name))
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def flaky(payload, progress):
+            self.calls.append(payload)
+            if payload.get('fail'):
+                raise RuntimeError('boom')
+            progress(50)
+
+        patcher = mock.patch.dict(REGISTRY, {'test_flaky': flaky})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_successful_task_is_done(self):
+        queued = enqueue('test_flaky', {'n': 1})
+        claimed = claim_next_task()
+        self.assertEqual(claimed.pk, queued.pk)
+        self.assertIsNone(claim_next_task())
+
+        self.assertTrue(run_task(claimed))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, BackgroundTask.STATUS_DONE)
+        self.assertEqual(queued.progress, 100)
+        self.assertEqual(queued.attempts, 1)
+
+    def test_failures_are_retried_with_backoff_then_fail(self):
+        queued = enqueue('test_flaky', {'fail': True}, max_attempts=2)
+
+        with self.assertLogs('portfolio.tasks', 'ERROR'):
+            self.assertFalse(run_task(claim_next_task()))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, BackgroundTask.STATUS_PENDING)
+        self.assertGreater(queued.run_after, timezone.now())
+        self.assertIn('RuntimeError: boom', queued.last_error)
+        # Not runnable until the backoff has passed
+        self.assertIsNone(claim_next_task())
+
+        BackgroundTask.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        with self.assertLogs('portfolio.tasks', 'ERROR'):
+            self.assertFalse(run_task(claim_next_task()))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, BackgroundTask.STATUS_FAILED)
+        self.assertEqual(queued.attempts, 2)
+        self.assertIsNone(claim_next_task())
+        self.assertEqual(len(self.calls), 2)
+
+    def test_unique_tasks_are_not_queued_twice(self):
+        first = enqueue('test_flaky', {'n': 1}, unique=True)
+        second = enqueue('test_flaky', {'n': 1}, unique=True)
+        self.assertEqual(first.pk, second.pk)
+
+
+class TokenBucketLimiterTests(TestCase):
+    def test_burst_then_refill(self):
+        limiter = TokenBucketLimiter(capacity=2, refill_seconds=10)
+        self.assertEqual([limiter.allow('ip', now=0) for _ in range(3)], [True, True, False])
+        self.assertFalse(limiter.allow('ip', now=5))
+        self.assertTrue(limiter.allow('ip', now=15))
+        self.assertFalse(limiter.allow('ip', now=15))
+
+    def test_keys_have_separate_buckets(self):
+        limiter = TokenBucketLimiter(capacity=1, refill_seconds=10)
+        self.assertTrue(limiter.allow('a', now=0))
+        self.assertFalse(limiter.allow('a', now=0))
+        self.assertTrue(limiter.allow('b', now=0))
+
+    def test_least_recently_used_buckets_are_evicted(self):
+        limiter = TokenBucketLimiter(capacity=1, refill_seconds=10)
+        limiter.MAX_BUCKETS = 2
+        limiter.allow('a', now=0)
+        limiter.allow('b', now=0)
+        limiter.allow('a', now=0)
+        limiter.allow('c', now=0)
+        self.assertEqual(list(limiter.buckets), ['a', 'c'])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_cache_backend(self):
+        limiter = TokenBucketLimiter(capacity=1, refill_seconds=10, use_cache=True, prefix='test')
+        self.assertTrue(limiter.allow('ip', now=100))
+        self.assertFalse(limiter.allow('ip', now=101))
+        self.assertTrue(limiter.allow('ip', now=111))
+
+
+class StaticMediaMiddlewareTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        with open(f'{self.root}/resume.pdf', 'wb') as f:
+            f.write(bytes(range(100)))
+        settings = override_settings(
+            PORTFOLIO_SERVE_FILES=True, STATIC_URL='/static/', STATIC_ROOT=self.root,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.middleware = StaticMediaMiddleware(lambda request: HttpResponse(status=404))
+        self.factory = RequestFactory()
+
+    def get(self, **headers):
+        return self.middleware(self.factory.get('/static/resume.pdf', headers=headers))
+
+    def test_full_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(100)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_byte_range(self):
+        response = self.get(range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(10, 20)))
+
+    def test_open_and_suffix_ranges(self):
+        response = self.get(range='bytes=95-')
+        self.assertEqual(b''.join(response.streaming_content), bytes(range(95, 100)))
+        response = self.get(range='bytes=-3')
+        self.assertEqual(response['Content-Range'], 'bytes 97-99/100')
+
+    def test_unsatisfiable_range(self):
+        response = self.get(range='bytes=200-300')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_stale_if_range_serves_whole_file(self):
+        response = self.get(range='bytes=0-9', if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(if_none_match=etag).status_code, 304)
+
+
+# The manifest storage needs collectstatic, which tests don't run
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'portfolio.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class SubmissionInboxTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+        now = timezone.now()
+        # Two submissions share each timestamp, so pages split on the id too
+        self.submissions = []
+        for i in range(7):
+            submission = create_submission(name=f'Sender {i}')
+            ContactSubmission.objects.filter(pk=submission.pk).update(
+                submitted_at=now - timedelta(minutes=i // 2)
+            )
+            self.submissions.append(submission)
+
+    def changelist(self, query=''):
+        url = reverse('admin:portfolio_contactsubmission_changelist') + query
+        with mock.patch.object(ContactSubmissionAdmin, 'list_per_page', 3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    def test_keyset_pages_cover_every_submission_once(self):
+        expected = list(ContactSubmission.objects.order_by('-submitted_at', '-pk').values_list('pk', flat=True))
+        pages = []
+        cl = self.changelist()
+        self.assertIsNone(cl.newer_url)
+        while True:
+            pages.append([row.pk for row in cl.result_list.order_by('-submitted_at', '-pk')])
+            if not cl.older_url:
+                break
+            cl = self.changelist(cl.older_url)
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        # And back again from the last page
+        newer = self.changelist(cl.newer_url)
+        self.assertEqual(
+            [row.pk for row in newer.result_list.order_by('-submitted_at', '-pk')], pages[1]
+        )
+
+    def test_search_index_follows_edits(self):
+        submission = self.submissions[0]
+        queryset = ContactSubmission.objects.all()
+        self.assertEqual(list(search_submissions(queryset, 'sende')).count(submission), 1)
+        ContactSubmission.objects.filter(pk=submission.pk).update(message='Goalkeeping trials')
+        self.assertEqual(list(search_submissions(queryset, 'goalkeep')), [submission])
+        submission.delete()
+        self.assertFalse(search_submissions(queryset, 'goalkeep').exists())
+
+    def test_search_index_repaired_after_table_rebuild(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 index is SQLite only')
+        # Rebuilding the table for a schema change drops its triggers
+        with connection.cursor() as cursor:
+            for name in SUBMISSION_FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER {name}')
+        missed = create_submission(message='Written while the triggers were gone')
+        queryset = ContactSubmission.objects.all()
+        self.assertFalse(search_submissions(queryset, 'triggers').exists())
+
+        self.assertTrue(ensure_search_index(connection))
+        self.assertEqual(list(search_submissions(queryset, 'triggers')), [missed])
+        self.assertFalse(ensure_search_index(connection))
+
+        added = create_submission(message='Indexed again by triggers')
+        self.assertEqual(set(search_submissions(queryset, 'triggers')), {missed, added})
+
+
+class SubmissionArchiveTests(TestCase):
+    def setUp(self):
+        old = timezone.now() - timedelta(days=400)
+        for i in range(5):
+            submission = create_submission(
+                name=f'Sender {i}', age_group=['U8', 'U10'][i % 2], is_read=i < 4,
+                admin_notes=f'Note {i}',
+            )
+            ContactSubmission.objects.filter(pk=submission.pk).update(
+                submitted_at=old + timedelta(days=i, microseconds=i)
+            )
+        # Rollups recorded on creation are keyed by the real submission day
+        rebuild_rollups()
+
+    def rows(self, queryset=None):
+        return list((queryset or ContactSubmission.objects.all()).order_by('pk').values())
+
+    def rollups(self):
+        return list(SubmissionDailyCount.objects.order_by('day', 'interest_type', 'age_group').values_list(
+            'day', 'interest_type', 'age_group', 'count'
+        ))
+
+    def test_archive_and_restore_round_trip(self):
+        before = self.rows()
+        rollups = self.rollups()
+
+        archives = list(archive_submissions(archivable(), chunk_size=3))
+        self.assertEqual([archive.count for archive in archives], [3, 1])
+        # Only the unread submission stays in the live table
+        self.assertEqual([row['name'] for row in self.rows()], ['Sender 4'])
+        self.assertEqual(self.rollups(), rollups)
+
+        for archive in archives:
+            restore_archive(archive)
+        self.assertFalse(SubmissionArchive.objects.exists())
+        self.assertEqual(self.rows(), before)
+        self.assertEqual(self.rollups(), rollups)
+
+    def test_rebuild_counts_archived_submissions(self):
+        rollups = self.rollups()
+        list(archive_submissions(archivable()))
+        self.assertEqual(rebuild_rollups(), 5)
+        self.assertEqual(self.rollups(), rollups)
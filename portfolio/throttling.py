@@ -0,0 +1,168 @@
+"""
+Abuse protection for the contact endpoints.
+
+A token-bucket rate limiter (per client IP and per email address) and a
+cheap heuristic spam scorer run before a submission is saved, so floods
+are rejected without touching the database. Buckets live in process memory
+by default; set ``PORTFOLIO_RATE_LIMIT_BACKEND = 'cache'`` to share them
+between workers through the Django cache.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+# (burst size, seconds to regain one token)
+DEFAULT_RATE_LIMITS = {
+    'ip': (5, 60),
+    'email': (3, 300),
+}
+
+DEFAULT_SPAM_THRESHOLD = 5
+
+SPAM_KEYWORDS = (
+    'casino', 'crypto', 'bitcoin', 'forex', 'viagra', 'loan', 'seo services',
+    'backlinks', 'guest post', 'click here', 'buy now', 'earn money', 'work from home',
+)
+
+URL_RE = re.compile(r'https?://|www\.', re.IGNORECASE)
+BBCODE_RE = re.compile(r'\[url=|\[/url\]|<a\s', re.IGNORECASE)
+REPEAT_RE = re.compile(r'(.)\1{7,}')
+CYRILLIC_RE = re.compile(r'[Ѐ-ӿ]')
+
+
+def get_rate_limits():
+    return getattr(settings, 'PORTFOLIO_CONTACT_RATE_LIMITS', DEFAULT_RATE_LIMITS)
+
+
+def get_spam_threshold():
+    return getattr(settings, 'PORTFOLIO_SPAM_THRESHOLD', DEFAULT_SPAM_THRESHOLD)
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string. Each bucket holds up to
+    ``capacity`` tokens and regains one every ``refill_seconds``.
+    """
+
+    # Beyond this many in-memory buckets, the least recently used are dropped
+    MAX_BUCKETS = 10000
+
+    def __init__(self, capacity, refill_seconds, use_cache=False, prefix='bucket'):
+        self.capacity = capacity
+        self.rate = 1.0 / refill_seconds
+        self.use_cache = use_cache
+        self.prefix = prefix
+        self.config = (capacity, refill_seconds, use_cache)
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _refill(self, state, now):
+        tokens, updated = state
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def allow(self, key, now=None):
+        """Take a token for ``key``; False when the bucket is empty"""
+        if self.use_cache:
+            # Wall-clock time so timestamps are comparable across processes
+            return self._allow_cached(key, time.time() if now is None else now)
+        now = time.monotonic() if now is None else now
+
+        with self.lock:
+            state = self.buckets.get(key)
+            tokens = self.capacity if state is None else self._refill(state, now)
+            allowed = tokens >= 1
+            self.buckets[key] = (tokens - 1 if allowed else tokens, now)
+            self.buckets.move_to_end(key)
+            # Constant time per request, even while flooded from many IPs
+            while len(self.buckets) > self.MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+            return allowed
+
+    def _allow_cached(self, key, now):
+        # Read-modify-write is not atomic across processes; an occasional
+        # extra request slipping through is acceptable for spam control
+        cache_key = f'portfolio:{self.prefix}:{key}'
+        state = cache.get(cache_key)
+        tokens = self.capacity if state is None else self._refill(state, now)
+        allowed = tokens >= 1
+        timeout = int(self.capacity / self.rate) + 1
+        cache.set(cache_key, (tokens - 1 if allowed else tokens, now), timeout)
+        return allowed
+
+
+_limiters = {}
+
+
+def get_limiter(scope):
+    """Shared limiter for ``scope`` ('ip' or 'email')"""
+    capacity, refill_seconds = get_rate_limits()[scope]
+    use_cache = getattr(settings, 'PORTFOLIO_RATE_LIMIT_BACKEND', 'memory') == 'cache'
+    limiter = _limiters.get(scope)
+    if limiter is None or limiter.config != (capacity, refill_seconds, use_cache):
+        limiter = TokenBucketLimiter(capacity, refill_seconds, use_cache, prefix=f'rate:{scope}')
+        _limiters[scope] = limiter
+    return limiter
+
+
+def get_client_ip(request):
+    """
+    Client address. Set PORTFOLIO_CLIENT_IP_HEADER (e.g. 'HTTP_X_REAL_IP')
+    when running behind a proxy that sets it.
+    """
+    header = getattr(settings, 'PORTFOLIO_CLIENT_IP_HEADER', None)
+    if header and request.META.get(header):
+        return request.META[header].split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def spam_score(data):
+    """
+    Score cleaned contact form data; higher is spammier. Returns
+    ``(score, reasons)``.
+    """
+    name = data.get('name', '') or ''
+    subject = data.get('subject', '') or ''
+    message = data.get('message', '') or ''
+    text = f'{subject}\n{message}'.lower()
+    score, reasons = 0, []
+
+    def flag(points, reason):
+        nonlocal score
+        score += points
+        reasons.append(reason)
+
+    links = len(URL_RE.findall(message))
+    if links:
+        flag(min(links, 3) * 2, f'{links} link(s)')
+    if BBCODE_RE.search(message):
+        flag(3, 'link markup')
+    if URL_RE.search(name) or URL_RE.search(subject):
+        flag(4, 'link in name/subject')
+    keywords = [word for word in SPAM_KEYWORDS if word in text]
+    if keywords:
+        flag(2 * len(keywords), 'keywords: ' + ', '.join(keywords))
+    letters = [c for c in message if c.isalpha()]
+    if len(letters) > 20 and sum(c.isupper() for c in letters) / len(letters) > 0.7:
+        flag(2, 'mostly capitals')
+    if REPEAT_RE.search(message):
+        flag(2, 'repeated characters')
+    if CYRILLIC_RE.search(text):
+        flag(2, 'unexpected script')
+    if name and name == subject == message:
+        flag(3, 'identical fields')
+    return score, reasons
+
+
+def allow_ip(request):
+    """Take a token from the client IP's bucket"""
+    return get_limiter('ip').allow(get_client_ip(request))
+
+
+def allow_email(email):
+    """Take a token from the submitting email address's bucket"""
+    return get_limiter('email').allow(email.strip().lower())
+
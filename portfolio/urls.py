@@ -1,9 +1,16 @@
 from django.urls import path
-from .views import HomeView, contact_submit
+from .views import (
+    HomeView, ProjectListView, ProjectDetailView,
+    contact_submit, contact_validate, contact_ingest,
+)
 
 app_name = 'portfolio'
 
 urlpatterns = [
     path('', HomeView.as_view(), name='home'),
+    path('projects/', ProjectListView.as_view(), name='project_list'),
+    path('projects/<slug:slug>/', ProjectDetailView.as_view(), name='project_detail'),
     path('contact/', contact_submit, name='contact_submit'),
+    path('contact/validate/', contact_validate, name='contact_validate'),
+    path('contact/ingest/', contact_ingest, name='contact_ingest'),
 ]
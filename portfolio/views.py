@@ -1,52 +1,246 @@
-from django.shortcuts import render, redirect
+import logging
+
+from django.conf import settings
+from django.shortcuts import redirect
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.views.generic import TemplateView
-from .models import AboutMe, Experience, BombayShark, Certification, CompanyLogo
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import patch_cache_control
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from django.views.generic import DetailView, ListView, TemplateView
+from django.views.static import serve
+from .models import AboutMe, Experience, BombayShark, Certification, CompanyLogo, Project
 from .forms import ContactForm
+from .ingest import batcher, write_batch
+from .replica import PublicReadMixin
+from .throttling import allow_email, allow_ip, get_spam_threshold, spam_score
+from .notifications import queue_notifications
+from .cache import (
+    CSRF_TOKEN_PLACEHOLDER, get_page_cache_timeout, page_cache_key,
+    get_section_cache_timeout, get_section_versions,
+)
+
+logger = logging.getLogger(__name__)
 
 
-class HomeView(TemplateView):
+class HomeView(PublicReadMixin, TemplateView):
     """
     Main portfolio landing page
     """
     template_name = 'portfolio/home.html'
+    use_csrf_placeholder = False
+    
+    def get(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().get(request, *args, **kwargs)
+        
+        # Serve anonymous traffic from the versioned page cache
+        key = page_cache_key(request.path)
+        content = cache.get(key)
+        if content is None:
+            self.use_csrf_placeholder = True
+            response = super().get(request, *args, **kwargs)
+            content = response.render().content.decode(response.charset)
+            cache.set(key, content, get_page_cache_timeout())
+        
+        return HttpResponse(content.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request)))
+    
+    def is_cacheable(self, request):
+        """Only share pages between anonymous visitors with no pending messages"""
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if request.user.is_authenticated:
+            return False
+        # len() loads messages without marking them as displayed
+        return not len(messages.get_messages(request))
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get all portfolio content
-        context['about_me'] = AboutMe.objects.first()
+        # Get all portfolio content - kept lazy so sections served from the
+        # fragment cache never hit the database
+        context['about_me'] = SimpleLazyObject(AboutMe.objects.first)
         context['experiences'] = Experience.objects.all()
-        context['bombay_sharks'] = BombayShark.objects.first()
+        context['bombay_sharks'] = SimpleLazyObject(BombayShark.objects.first)
         context['certifications'] = Certification.objects.all()
         context['companies'] = CompanyLogo.objects.filter(display_on_homepage=True)
-        context['contact_form'] = ContactForm()
+        context.setdefault('contact_form', ContactForm())
+        context['async_contact'] = getattr(settings, 'PORTFOLIO_ASYNC_CONTACT', False)
+        
+        context['section_versions'] = get_section_versions()
+        context['section_cache_timeout'] = get_section_cache_timeout()
+        
+        if self.use_csrf_placeholder:
+            context['csrf_token'] = CSRF_TOKEN_PLACEHOLDER
         
         return context
 
 
+class ProjectListView(PublicReadMixin, ListView):
+    """
+    All project case studies
+    """
+    template_name = 'portfolio/project_list.html'
+    context_object_name = 'projects'
+    # The story fields are only shown on the detail page
+    queryset = Project.objects.defer(
+        'problem', 'solution', 'impact', 'problem_html', 'solution_html', 'impact_html'
+    )
+
+
+class ProjectDetailView(PublicReadMixin, DetailView):
+    """
+    Single project case study with its gallery and testimonials, loaded in
+    three queries however large the gallery is
+    """
+    template_name = 'portfolio/project_detail.html'
+    context_object_name = 'project'
+    # Templates only use the pre-rendered story columns
+    queryset = Project.objects.defer('problem', 'solution', 'impact').prefetch_related(
+        'gallery_images', 'testimonials'
+    )
+
+
+CONTACT_SUCCESS_MESSAGE = 'Thank you for your message! We will get back to you soon.'
+CONTACT_ERROR_MESSAGE = 'There was an error with your submission. Please check the form.'
+CONTACT_RATE_LIMITED_MESSAGE = 'Too many messages sent. Please wait a few minutes and try again.'
+CONTACT_SPAM_MESSAGE = 'Your message could not be accepted. Please email us directly instead.'
+
+
+def is_ajax(request):
+    """Requests sent by the progressively-enhanced contact form in main.js"""
+    return request.headers.get('x-requested-with') == 'XMLHttpRequest'
+
+
+def form_errors(form):
+    """Form errors as a JSON-serializable {field: [messages]} dict"""
+    return {field: list(errors) for field, errors in form.errors.items()}
+
+
+def contact_rejected(request, message, status):
+    """Response for a submission refused before it reaches the database"""
+    if is_ajax(request):
+        return JsonResponse({'ok': False, 'message': message}, status=status)
+    messages.error(request, message)
+    return redirect('portfolio:home')
+
+
+def screen_submission(form):
+    """
+    Rate-limit and spam-check a valid form. Returns ``(message, status)``
+    when the submission must be refused, or None if it may be saved.
+    """
+    if not allow_email(form.cleaned_data['email']):
+        return CONTACT_RATE_LIMITED_MESSAGE, 429
+    score, reasons = spam_score(form.cleaned_data)
+    if score >= get_spam_threshold():
+        logger.info('Rejected contact submission as spam (score %d: %s)', score, '; '.join(reasons))
+        return CONTACT_SPAM_MESSAGE, 400
+    return None
+
+
+def contact_csrf(view):
+    """
+    Exempt a contact endpoint from CSRF checks when the site is published
+    with export_static (PORTFOLIO_CONTACT_CSRF_EXEMPT)
+    """
+    if getattr(settings, 'PORTFOLIO_CONTACT_CSRF_EXEMPT', False):
+        return csrf_exempt(view)
+    return view
+
+
+@contact_csrf
+@require_POST
+def contact_validate(request):
+    """
+    Validate the contact form without saving it and return the field
+    errors as JSON, so the page never has to be rebuilt to show them
+    """
+    form = ContactForm(request.POST)
+    valid = form.is_valid()
+    return JsonResponse({'valid': valid, 'errors': {} if valid else form_errors(form)})
+
+
+@contact_csrf
 def contact_submit(request):
     """
     Handle contact form submission
     """
     if request.method == 'POST':
+        # Cheapest check first: floods are refused before any form work
+        if not allow_ip(request):
+            return contact_rejected(request, CONTACT_RATE_LIMITED_MESSAGE, status=429)
+        
         form = ContactForm(request.POST)
         if form.is_valid():
-            form.save()
-            messages.success(request, 
-                           'Thank you for your message! We will get back to you soon.')
-            return redirect('home')
-        else:
-            messages.error(request, 
-                         'There was an error with your submission. Please check the form.')
-            # Return to home with form errors
-            return render(request, 'portfolio/home.html', {
-                'contact_form': form,
-                'about_me': AboutMe.objects.first(),
-                'experiences': Experience.objects.all(),
-                'bombay_sharks': BombayShark.objects.first(),
-                'certifications': Certification.objects.all(),
-                'companies': CompanyLogo.objects.filter(display_on_homepage=True),
-            })
+            rejection = screen_submission(form)
+            if rejection:
+                return contact_rejected(request, *rejection)
+            submission = form.save()
+            queue_notifications([submission])
+            if is_ajax(request):
+                return JsonResponse({'ok': True, 'message': CONTACT_SUCCESS_MESSAGE})
+            messages.success(request, CONTACT_SUCCESS_MESSAGE)
+            return redirect('portfolio:home')
+        
+        if is_ajax(request):
+            return JsonResponse({
+                'ok': False,
+                'message': CONTACT_ERROR_MESSAGE,
+                'errors': form_errors(form),
+            }, status=400)
+        
+        # No-JavaScript fallback: rebuild the home page around the bound form
+        messages.error(request, CONTACT_ERROR_MESSAGE)
+        view = HomeView()
+        view.setup(request)
+        return view.get(request, contact_form=form)
+    
+    return redirect('portfolio:home')
+
+
+@contact_csrf
+@require_POST
+async def contact_ingest(request):
+    """
+    Async fast path for the enhanced contact form (PORTFOLIO_ASYNC_CONTACT).
+    Acknowledges a valid submission immediately; the batched writer
+    persists it and queues staff notifications off the request.
+    """
+    if not allow_ip(request):
+        return JsonResponse({'ok': False, 'message': CONTACT_RATE_LIMITED_MESSAGE}, status=429)
+    
+    form = ContactForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({
+            'ok': False,
+            'message': CONTACT_ERROR_MESSAGE,
+            'errors': form_errors(form),
+        }, status=400)
+    rejection = screen_submission(form)
+    if rejection:
+        message, status = rejection
+        return JsonResponse({'ok': False, 'message': message}, status=status)
     
-    return redirect('home')
+    data = {field: form.cleaned_data[field] for field in ContactForm.Meta.fields}
+    if isinstance(request, ASGIRequest):
+        await batcher.submit(data)
+    else:
+        # Under WSGI there is no long-lived event loop to batch on
+        await sync_to_async(write_batch)([data])
+    return JsonResponse({'ok': True, 'message': CONTACT_SUCCESS_MESSAGE}, status=202)
+
+
+def content_addressed_media(request, path):
+    """
+    Serve a content-addressed upload. The URL embeds the file's hash, so
+    browsers and proxies may cache it forever.
+    """
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+    return response
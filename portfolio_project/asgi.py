@@ -3,6 +3,11 @@ ASGI config for portfolio_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving the site through this application (e.g. ``uvicorn
+portfolio_project.asgi:application``) with PORTFOLIO_ASYNC_CONTACT enabled
+routes the contact form to the async ingestion view, which acknowledges
+immediately and batches database writes on the server's event loop.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
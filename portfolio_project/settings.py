@@ -44,6 +44,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Serves STATIC_ROOT and MEDIA_ROOT when PORTFOLIO_SERVE_FILES is on
+    "portfolio.middleware.StaticMediaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -75,13 +77,123 @@ WSGI_APPLICATION = "portfolio_project.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# SQLite tuned for a read-heavy site with occasional writes:
+# - WAL lets home page reads continue while a contact submission is written
+# - synchronous=NORMAL is durable under WAL and avoids an fsync per commit
+# - cache_size is in KiB when negative; mmap_size is in bytes
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Reuse connections between requests in production (pragmas are
+        # applied once per connection); runserver opens one per request
+        "CONN_MAX_AGE": 0 if DEBUG else 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Seconds a writer waits for the lock before "database is locked"
+            "timeout": 20,
+            # Take the write lock at BEGIN so concurrent writers queue on the
+            # busy timeout instead of failing mid-transaction
+            "transaction_mode": "IMMEDIATE",
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+        },
     }
 }
 
+# Read-only snapshot for public pages (see portfolio/replica.py). Anonymous
+# visitors read from a copy of the database refreshed by the background
+# worker after every content edit, so admin bulk edits and contact floods
+# never block them. Set to e.g. BASE_DIR / "db-replica.sqlite3" to enable;
+# requires `run_worker` (or a scheduled `refresh_replica`).
+PORTFOLIO_READ_REPLICA = None
+
+if PORTFOLIO_READ_REPLICA:
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{PORTFOLIO_READ_REPLICA}?mode=ro",
+        # Reconnect per request so a refreshed snapshot is picked up at once
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+                if name in ("cache_size", "mmap_size", "temp_store")
+            ),
+        },
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["portfolio.replica.PublicReadRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# The rendered homepage is cached under a content version bumped by model
+# signals. Use a cache shared between workers (e.g. FileBasedCache or
+# Memcached) when running more than one process, so admin edits invalidate
+# every worker at once.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "portfolio",
+    }
+}
+
+# Upper bound on how long a rendered page is kept; edits invalidate it
+# immediately regardless of this value.
+PORTFOLIO_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+# Contact submissions
+# With the site served over ASGI, the enhanced contact form can post to the
+# async ingestion view, which acknowledges at once and batches writes.
+PORTFOLIO_ASYNC_CONTACT = False
+PORTFOLIO_INGEST_BATCH_SIZE = 50
+PORTFOLIO_INGEST_MAX_DELAY = 0.05  # seconds
+# Turn on when the public pages are published with export_static: exported
+# pages can't carry a CSRF token matching each visitor's cookie, so the
+# contact endpoints then rely on the rate limits and spam scoring alone.
+PORTFOLIO_CONTACT_CSRF_EXEMPT = False
+
+# Abuse protection: token buckets as (burst, seconds to regain one token),
+# kept in process memory or, with "cache", shared through CACHES
+PORTFOLIO_CONTACT_RATE_LIMITS = {
+    "ip": (5, 60),
+    "email": (3, 300),
+}
+PORTFOLIO_RATE_LIMIT_BACKEND = "memory"
+PORTFOLIO_SPAM_THRESHOLD = 5
+# Request header carrying the real client IP when behind a proxy
+# (e.g. "HTTP_X_REAL_IP" on PythonAnywhere); None uses REMOTE_ADDR
+PORTFOLIO_CLIENT_IP_HEADER = None
+
+# Staff notifications for new submissions, delivered by `run_worker`
+PORTFOLIO_NOTIFY_EMAILS = []
+PORTFOLIO_NOTIFY_WEBHOOKS = []
+# Local outbox: every notification is also written here as a JSON file
+PORTFOLIO_NOTIFICATION_OUTBOX = BASE_DIR / "outbox" if DEBUG else None
+
+# Read submissions older than this move to the compressed archive table
+# (`archive_submissions`), in chunks of PORTFOLIO_ARCHIVE_CHUNK_SIZE rows
+PORTFOLIO_ARCHIVE_AFTER_DAYS = 180
+PORTFOLIO_ARCHIVE_CHUNK_SIZE = 1000
+
+if DEBUG:
+    # Emails land in the outbox as files instead of going to SMTP
+    EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+    EMAIL_FILE_PATH = BASE_DIR / "outbox" / "email"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -125,6 +237,41 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Serve static files and uploads from Django itself (with ETags, byte ranges
+# and pre-compressed variants) instead of relying on web server mappings.
+# Off under DEBUG, where runserver and the DEBUG URL patterns serve them.
+PORTFOLIO_SERVE_FILES = not DEBUG
+
+# Uploads are stored once per distinct content under content/<sha256>,
+# which makes their URLs safe to cache forever
+STORAGES = {
+    "default": {
+        "BACKEND": "portfolio.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        # Bundles, fingerprints and pre-compresses assets at collectstatic
+        "BACKEND": "portfolio.staticfiles.BundledManifestStorage",
+    },
+}
+
+# Static bundles built by collectstatic: bundle name -> source files, in order
+PORTFOLIO_STATIC_BUNDLES = {
+    "css/site.css": [
+        "css/main.css",
+        "css/components.css",
+        "css/animations.css",
+        "css/smooth-animations.css",
+        "css/responsive.css",
+    ],
+    "js/site.js": [
+        "js/main.js",
+    ],
+}
+
+# Responsive image derivatives generated for every uploaded ImageField
+PORTFOLIO_IMAGE_WIDTHS = (480, 960, 1600)
+PORTFOLIO_IMAGE_QUALITY = 80
+
 # CKEditor Configuration
 CKEDITOR_UPLOAD_PATH = "uploads/"
 CKEDITOR_CONFIGS = {
@@ -16,9 +16,11 @@ Including another URLconf
 """
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from portfolio.storage import CONTENT_PREFIX
+from portfolio.views import content_addressed_media
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -28,5 +30,10 @@ urlpatterns = [
 
 # Serve media files in development
 if settings.DEBUG:
+    # Hashed uploads get immutable cache headers; must precede static()
+    urlpatterns += [
+        re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>{CONTENT_PREFIX}/.*)$",
+                content_addressed_media),
+    ]
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -38,10 +38,15 @@ document.addEventListener('DOMContentLoaded', function () {
     }
 
     // === SMOOTH SCROLL ===
-    document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    // Navbar links point at home page sections ("/#about") so they also work
+    // from the project pages; only same-page targets are scrolled to
+    document.querySelectorAll('a[href*="#"]').forEach(anchor => {
         anchor.addEventListener('click', function (e) {
+            if (this.pathname !== window.location.pathname) {
+                return;
+            }
             e.preventDefault();
-            const target = document.querySelector(this.getAttribute('href'));
+            const target = this.hash && document.querySelector(this.hash);
             if (target) {
                 const offset = 80; // navbar height
                 const targetPosition = target.offsetTop - offset;
@@ -62,7 +67,7 @@ document.addEventListener('DOMContentLoaded', function () {
             const sectionHeight = section.offsetHeight;
             const sectionTop = section.offsetTop - 100;
             const sectionId = section.getAttribute('id');
-            const navLink = document.querySelector(`.navbar-link[href="#${sectionId}"]`);
+            const navLink = document.querySelector(`.navbar-link[href$="#${sectionId}"]`);
 
             if (scrollY > sectionTop && scrollY <= sectionTop + sectionHeight) {
                 navbarLinks.forEach(link => link.classList.remove('active'));
@@ -187,24 +192,107 @@ document.addEventListener('DOMContentLoaded', function () {
     }
 
     // === FORM VALIDATION ENHANCEMENT ===
+    // Progressive enhancement: fields are validated against the server as
+    // they are edited and the form is submitted with fetch, so errors never
+    // require a full page rebuild. Without JS the form posts normally.
     const contactForm = document.querySelector('.contact-form');
-    if (contactForm) {
-        contactForm.addEventListener('submit', function (e) {
-            const inputs = contactForm.querySelectorAll('[required]');
-            let isValid = true;
-
-            inputs.forEach(input => {
-                if (!input.value.trim()) {
-                    isValid = false;
+    if (contactForm && window.fetch && window.FormData) {
+        const touchedFields = new Set();
+
+        function showFieldErrors(errors, onlyTouched) {
+            contactForm.querySelectorAll('[name]').forEach(input => {
+                const group = input.closest('.form-group');
+                if (!group || input.type === 'hidden') {
+                    return;
+                }
+                const fieldErrors = errors[input.name];
+                const show = fieldErrors && (!onlyTouched || touchedFields.has(input.name));
+                let errorEl = group.querySelector('.error');
+
+                if (show) {
+                    if (!errorEl) {
+                        errorEl = document.createElement('span');
+                        errorEl.className = 'error';
+                        group.appendChild(errorEl);
+                    }
+                    errorEl.textContent = fieldErrors[0];
                     input.style.borderColor = '#ef4444';
                 } else {
-                    input.style.borderColor = 'rgba(255, 255, 255, 0.1)';
+                    if (errorEl) {
+                        errorEl.remove();
+                    }
+                    input.style.borderColor = '';
                 }
             });
+        }
 
-            if (!isValid) {
-                e.preventDefault();
+        function showMessage(text, type) {
+            let container = document.querySelector('.messages');
+            if (!container) {
+                container = document.createElement('div');
+                container.className = 'messages';
+                document.body.appendChild(container);
             }
+            const message = document.createElement('div');
+            message.className = `message ${type}`;
+            message.textContent = text;
+            container.appendChild(message);
+            setTimeout(() => {
+                message.style.animation = 'slideOutRight 0.3s ease forwards';
+                setTimeout(() => message.remove(), 300);
+            }, 5000);
+        }
+
+        function postForm(url) {
+            return fetch(url, {
+                method: 'POST',
+                body: new FormData(contactForm),
+                headers: { 'X-Requested-With': 'XMLHttpRequest' },
+                credentials: 'same-origin'
+            }).then(response => response.json());
+        }
+
+        const validateFields = debounce(function () {
+            postForm(contactForm.dataset.validateUrl)
+                .then(data => showFieldErrors(data.errors || {}, true))
+                .catch(() => { /* Server validation still runs on submit */ });
+        }, 400);
+
+        contactForm.addEventListener('change', function (e) {
+            if (e.target.name) {
+                touchedFields.add(e.target.name);
+                validateFields();
+            }
+        });
+
+        contactForm.addEventListener('submit', function (e) {
+            e.preventDefault();
+            const submitButton = contactForm.querySelector('[type="submit"]');
+            submitButton.disabled = true;
+
+            postForm(contactForm.dataset.submitUrl || contactForm.action)
+                .then(data => {
+                    if (data.ok) {
+                        contactForm.reset();
+                        touchedFields.clear();
+                        showFieldErrors({}, false);
+                        if (ageGroupField) {
+                            // Reset selects "general", which hides the age group
+                            ageGroupField.style.display = 'none';
+                        }
+                        showMessage(data.message, 'success');
+                    } else {
+                        showFieldErrors(data.errors || {}, false);
+                        showMessage(data.message, 'error');
+                    }
+                })
+                .catch(() => {
+                    // Network or server failure - fall back to a normal post
+                    contactForm.submit();
+                })
+                .finally(() => {
+                    submitButton.disabled = false;
+                });
         });
     }
 